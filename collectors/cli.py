@@ -1108,10 +1108,12 @@ def marketing(
         console.print("[bold]📝 SNS投稿候補生成中...[/bold]")
 
         generator = ContentGenerator(output_dir=marketing_dir / "content")
+        # 同じ実行で生成した候補は同じ生成日時にそろえる
+        run_at = datetime.now(timezone.utc)
 
         # トレンドから生成
         if trends:
-            candidates = generator.generate_from_trends(trend_results)
+            candidates = generator.generate_from_trends(trend_results, now=run_at)
         else:
             candidates = []
 
@@ -1124,11 +1126,13 @@ def marketing(
             week = digests[0].stem.replace("digest-", "")
             with open(digests[0], encoding="utf-8") as f:
                 digest_data = json.load(f)
-            candidates.extend(generator.generate_from_digest(week, digest_data))
+            candidates.extend(
+                generator.generate_from_digest(week, digest_data, now=run_at)
+            )
 
             # 保存
             if candidates:
-                path = generator.save_candidates(candidates, week)
+                path = generator.save_candidates(candidates, week, now=run_at)
                 console.print(f"[green]✅ 投稿候補保存: {path}[/green]")
 
                 table = Table(title=f"投稿候補 ({len(candidates)}件)")
@@ -1151,8 +1155,8 @@ def marketing(
         console.print()
         console.print("[bold]📊 効果測定サマリ[/bold]")
 
-        tracker = AnalyticsTracker(data_dir=marketing_dir / "analytics")
-        summary = tracker.get_performance_summary()
+        with AnalyticsTracker(data_dir=marketing_dir / "analytics") as tracker:
+            summary = tracker.get_performance_summary()
 
         if summary.get("posts_count", 0) > 0:
             panel = Panel(
@@ -2,20 +2,26 @@
 Zenn 記事 AI 評価器（段階フィルター方式 ②）
 
 send_consultation（MCP）経由で LLM に記事を評価させる。
-小バッチ（5件）+ 失敗時リトライ + フォールバック。
+バッチ（既定20件）+ 失敗時リトライ + フォールバック。
+バッチは ThreadPoolExecutor で並列に送信する（send_fn は I/O 待ちが支配的なため）。
 """
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+import orjson
 
 from collectors.models import CollectedEntry
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+
 
 @dataclass
 class ArticleEvaluation:
@@ -58,59 +64,125 @@ class EvaluationResult:
 def _parse_prefilter(entry: CollectedEntry) -> dict:
     """raw_content から prefilter データを取得"""
     try:
-        return json.loads(entry.raw_content) if entry.raw_content else {}
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(entry.raw_content) if entry.raw_content else {}
+    except (orjson.JSONDecodeError, TypeError):
         return {}
 
 
+def _fenced_block(text: str, start: int) -> str:
+    """コードブロック開始位置から閉じ ``` まで（なければ末尾まで）を返す"""
+    end = text.find("```", start)
+    return text[start : end if end != -1 else None].strip()
+
+
 class ArticleEvaluator:
     """Zenn 記事の AI 評価器（send_consultation 経由）"""
 
-    BATCH_SIZE = 5
-
-    def __init__(self, send_fn=None):
+    # 1記事あたり約300トークン + 固定プリアンブル約400トークン。
+    # 20件で約6Kトークンに収まり、プリアンブルの重複送信を 1/4 に抑えられる
+    BATCH_SIZE = 20
+    MAX_CONCURRENCY = 8
+    # prefilter スコアがこれ未満の記事は LLM に送らずフォールバック（skip）で確定
+    LLM_MIN_PREFILTER_SCORE = 1
+
+    def __init__(
+        self,
+        send_fn=None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        batch_size: int = BATCH_SIZE,
+    ):
         """
         Args:
             send_fn: send_consultation 相当の関数。
                      None の場合は MCP 経由で呼び出す想定（CLI から注入）。
+            max_concurrency: 同時に送信するバッチ数の上限
+            batch_size: 1回の LLM 呼び出しで評価する記事数
         """
         self.send_fn = send_fn
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
 
     def evaluate_batch(
         self, entries: list[CollectedEntry]
     ) -> EvaluationResult:
-        """小バッチ評価（BATCH_SIZE 件ずつ評価）"""
+        """バッチ評価（batch_size 件ずつ並列評価）
+
+        prefilter スコアが LLM_MIN_PREFILTER_SCORE 未満の記事は LLM に送らず
+        フォールバック評価とし、LLM 評価結果（入力順）の後ろに並べる。
+        """
         result = EvaluationResult(
             evaluated_at=datetime.now(timezone.utc).isoformat(),
             total=len(entries),
         )
 
-        for i in range(0, len(entries), self.BATCH_SIZE):
-            batch = entries[i : i + self.BATCH_SIZE]
-            try:
-                batch_results = self._evaluate_chunk(batch)
-                result.evaluations.extend(batch_results)
-                result.llm_evaluated += len(batch_results)
-            except Exception as e:
-                logger.warning(f"バッチ評価失敗（{len(batch)}件）: {e}")
-                # 失敗時は記事単位でリトライ
-                for entry in batch:
-                    try:
-                        single = self._evaluate_chunk([entry])
-                        result.evaluations.extend(single)
-                        result.llm_evaluated += 1
-                    except Exception as e2:
-                        logger.warning(f"単体評価失敗: {entry.title[:30]}: {e2}")
-                        result.evaluations.append(self._fallback_evaluation(entry))
-                        result.fallback_used += 1
+        # prefilter はリトライ・フォールバックでも使い回すため 1 回だけパース
+        llm_entries: list[CollectedEntry] = []
+        llm_prefilters: list[dict] = []
+        skipped: list[ArticleEvaluation] = []
+        for entry in entries:
+            prefilter = _parse_prefilter(entry)
+            if prefilter.get("prefilter_score", 0) >= self.LLM_MIN_PREFILTER_SCORE:
+                llm_entries.append(entry)
+                llm_prefilters.append(prefilter)
+            else:
+                skipped.append(self._fallback_evaluation(entry, prefilter))
+
+        starts = range(0, len(llm_entries), self.batch_size)
+        batches = [llm_entries[i : i + self.batch_size] for i in starts]
+        prefilter_batches = [llm_prefilters[i : i + self.batch_size] for i in starts]
+
+        if batches:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map は入力順に結果を返すため、バッチ順がそのまま維持される
+                for evaluations, llm_count, fallback_count in executor.map(
+                    self._evaluate_with_retry, batches, prefilter_batches
+                ):
+                    result.evaluations.extend(evaluations)
+                    result.llm_evaluated += llm_count
+                    result.fallback_used += fallback_count
+
+        result.evaluations.extend(skipped)
+        result.fallback_used += len(skipped)
 
         return result
 
-    def _build_prompt(self, entries: list[CollectedEntry]) -> str:
+    def _evaluate_with_retry(
+        self, batch: list[CollectedEntry], prefilters: list[dict]
+    ) -> tuple[list[ArticleEvaluation], int, int]:
+        """1 バッチを評価（失敗時は記事単位でリトライ → フォールバック）
+
+        Returns:
+            (評価結果リスト, LLM 評価件数, フォールバック件数)
+        """
+        try:
+            batch_results = self._evaluate_chunk(batch, prefilters)
+            return batch_results, len(batch_results), 0
+        except Exception as e:
+            logger.warning(f"バッチ評価失敗（{len(batch)}件）: {e}")
+
+        # 失敗時は記事単位でリトライ
+        evaluations: list[ArticleEvaluation] = []
+        llm_count = 0
+        fallback_count = 0
+        for entry, prefilter in zip(batch, prefilters):
+            try:
+                single = self._evaluate_chunk([entry], [prefilter])
+                evaluations.extend(single)
+                llm_count += 1
+            except Exception as e2:
+                logger.warning(f"単体評価失敗: {entry.title[:30]}: {e2}")
+                evaluations.append(self._fallback_evaluation(entry, prefilter))
+                fallback_count += 1
+
+        return evaluations, llm_count, fallback_count
+
+    def _build_prompt(
+        self, entries: list[CollectedEntry], prefilters: list[dict]
+    ) -> str:
         """評価プロンプトを構築"""
         articles = []
-        for i, entry in enumerate(entries):
-            prefilter = _parse_prefilter(entry)
+        for i, (entry, prefilter) in enumerate(zip(entries, prefilters)):
             articles.append(
                 f"[{i+1}] タイトル: {entry.title}\n"
                 f"    URL: {entry.url}\n"
@@ -148,13 +220,18 @@ JSON配列で出力してください。他のテキストは不要です。
 ```"""
 
     def _evaluate_chunk(
-        self, entries: list[CollectedEntry]
+        self,
+        entries: list[CollectedEntry],
+        prefilters: Optional[list[dict]] = None,
     ) -> list[ArticleEvaluation]:
-        """send_consultation で小バッチ評価"""
+        """send_consultation でバッチ評価"""
         if not self.send_fn:
             raise RuntimeError("send_fn が設定されていません")
 
-        prompt = self._build_prompt(entries)
+        if prefilters is None:
+            prefilters = [_parse_prefilter(entry) for entry in entries]
+
+        prompt = self._build_prompt(entries, prefilters)
 
         # send_consultation 呼び出し
         response = self.send_fn(
@@ -165,19 +242,21 @@ JSON配列で出力してください。他のテキストは不要です。
         )
 
         # レスポンスから JSON を抽出
-        evaluations = self._parse_response(response, entries)
+        evaluations = self._parse_response(response, entries, prefilters)
         return evaluations
 
     def _parse_response(
-        self, response: str, entries: list[CollectedEntry]
+        self,
+        response: str,
+        entries: list[CollectedEntry],
+        prefilters: list[dict],
     ) -> list[ArticleEvaluation]:
         """LLM レスポンスから評価結果をパース"""
-        # JSON 部分を抽出
-        json_str = self._extract_json(response)
-        if not json_str:
+        # JSON 部分を抽出（抽出と同時にパース済み）
+        raw_list = self._extract_json(response)
+        if raw_list is None:
             raise ValueError("レスポンスから JSON を抽出できません")
 
-        raw_list = json.loads(json_str)
         if not isinstance(raw_list, list):
             raise ValueError("レスポンスが JSON 配列ではありません")
 
@@ -186,7 +265,7 @@ JSON配列で出力してください。他のテキストは不要です。
             idx = item.get("index", 0) - 1
             if 0 <= idx < len(entries):
                 entry = entries[idx]
-                prefilter = _parse_prefilter(entry)
+                prefilter = prefilters[idx]
                 results.append(
                     ArticleEvaluation(
                         url=entry.url,
@@ -205,43 +284,38 @@ JSON配列で出力してください。他のテキストは不要です。
 
         return results
 
-    def _extract_json(self, text: str) -> Optional[str]:
-        """テキストから JSON 配列部分を抽出"""
+    def _extract_json(self, text: str) -> Optional[Any]:
+        """テキストから JSON 配列部分を抽出し、パース済みの値を返す"""
         # ```json ... ``` ブロックを探す
-        if "```json" in text:
-            start = text.index("```json") + 7
-            end = text.index("```", start)
-            return text[start:end].strip()
+        fence = text.find("```json")
+        if fence != -1:
+            return orjson.loads(_fenced_block(text, fence + 7))
 
         # ``` ... ``` ブロックを探す
-        if "```" in text:
-            start = text.index("```") + 3
-            end = text.index("```", start)
-            candidate = text[start:end].strip()
+        fence = text.find("```")
+        if fence != -1:
+            candidate = _fenced_block(text, fence + 3)
             if candidate.startswith("["):
-                return candidate
-
-        # [ から始まる JSON を探す
-        for i, c in enumerate(text):
-            if c == "[":
-                # 対応する ] を探す
-                depth = 0
-                for j in range(i, len(text)):
-                    if text[j] == "[":
-                        depth += 1
-                    elif text[j] == "]":
-                        depth -= 1
-                        if depth == 0:
-                            return text[i : j + 1]
-                break
+                return orjson.loads(candidate)
+
+        # [ から始まる JSON を探す（対応する ] までの走査は C 実装の raw_decode に任せる）
+        # orjson には途中位置からのデコードがないため、ここは標準 json を使う
+        idx = text.find("[")
+        while idx != -1:
+            try:
+                value, _ = _JSON_DECODER.raw_decode(text, idx)
+                return value
+            except json.JSONDecodeError:
+                idx = text.find("[", idx + 1)
 
         return None
 
     def _fallback_evaluation(
-        self, entry: CollectedEntry
+        self, entry: CollectedEntry, prefilter: Optional[dict] = None
     ) -> ArticleEvaluation:
         """LLM 失敗時のフォールバック（soft filter スコアのみで判定）"""
-        prefilter = _parse_prefilter(entry)
+        if prefilter is None:
+            prefilter = _parse_prefilter(entry)
         score = prefilter.get("prefilter_score", 0)
 
         # スコアから簡易判定
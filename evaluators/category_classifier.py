@@ -6,14 +6,92 @@ AI Update Radar - カテゴリ分類器
 """
 
 import re
+from collections.abc import Hashable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import ahocorasick
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml なしでビルドされた PyYAML
+    from yaml import SafeLoader
+
 from collectors.models import Category, CollectedEntry
 
+# 正規化用パターン（呼び出し毎のコンパイルを避けるためモジュールロード時に一度だけ生成）
+_SEPARATOR_RE = re.compile(r"[-_]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def _normalize(text: str) -> str:
+    """テキストを正規化（同一テキストの再分類に備えて結果をキャッシュ）"""
+    # 小文字化
+    text = text.lower()
+    # ハイフン・アンダースコアをスペースに
+    text = _SEPARATOR_RE.sub(" ", text)
+    # 複数スペースを単一に
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text
+
+
+# 無視キーワード用のグループキー
+_IGNORE_GROUP = "ignore"
+
+# 結果の category_scores 生成用（Enum の .value 参照を分類毎に繰り返さない）
+_CATEGORY_VALUES: tuple[tuple[Category, str], ...] = tuple((cat, cat.value) for cat in Category)
+
+# 単語構成文字の連なり（\b の判定基準と同じ \w）
+_WORD_RE = re.compile(r"\w+")
+
+# (グループ, 定義順, キーワード, 単語境界要否)
+KeywordHit = tuple[Hashable, int, str, bool]
+
+
+def _is_word_char(text: str, idx: int) -> bool:
+    """text[idx] が単語構成文字か（範囲外は False）"""
+    return 0 <= idx < len(text) and (text[idx].isalnum() or text[idx] == "_")
+
+
+@dataclass
+class _KeywordIndex:
+    """キーワード照合用インデックス
+
+    単語構成文字のみのキーワードの単語境界マッチは「テキスト中の単語（\\w+ の連なり）と
+    完全一致」と同値なので、トークン集合の引き当てで判定する。
+    フレーズや記号を含むキーワードは Aho-Corasick オートマトンで 1 パス走査する。
+    """
+
+    tokens: dict[str, list[KeywordHit]]
+    automaton: ahocorasick.Automaton
+
+
+def _build_index(groups: dict[Hashable, list[str]]) -> _KeywordIndex:
+    """グループ別キーワードから照合用インデックスを構築
+
+    同じキーワードが複数グループにあっても 1 エントリにまとめる。
+    """
+    tokens: dict[str, list[KeywordHit]] = {}
+    automaton = ahocorasick.Automaton()
+    for group, keywords in groups.items():
+        for order, kw in enumerate(keywords):
+            # 複数単語のキーワードはフレーズ（部分一致）、単語は単語境界でマッチ
+            is_phrase = " " in kw
+            hit = (group, order, kw, not is_phrase)
+            if not is_phrase and _WORD_RE.fullmatch(kw):
+                tokens.setdefault(kw, []).append(hit)
+            elif kw in automaton:
+                automaton.get(kw).append(hit)
+            else:
+                automaton.add_word(kw, [hit])
+    if len(automaton):
+        automaton.make_automaton()
+    return _KeywordIndex(tokens=tokens, automaton=automaton)
+
 
 @dataclass
 class ClassificationResult:
@@ -40,13 +118,26 @@ class CategoryClassifier:
         self.keywords_path = keywords_path
         self._load_keywords()
 
+    def refresh_keywords(self) -> bool:
+        """keywords.yaml が更新されていれば読み込み直す
+
+        Returns:
+            読み込み直した場合 True
+        """
+        if self.keywords_path.stat().st_mtime_ns == self.keywords_mtime:
+            return False
+        self._load_keywords()
+        return True
+
     def _load_keywords(self) -> None:
         """キーワード定義を読み込み"""
         if not self.keywords_path.exists():
             raise FileNotFoundError(f"Keywords file not found: {self.keywords_path}")
 
+        # 読み込んだ時点の mtime（refresh_keywords で変更検知に使う）
+        self.keywords_mtime = self.keywords_path.stat().st_mtime_ns
         with open(self.keywords_path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
 
         # カテゴリ別キーワードを展開
         self.category_keywords: dict[Category, list[str]] = {}
@@ -80,33 +171,41 @@ class CategoryClassifier:
         ignore_data = data.get("ignore", {})
         self.ignore_keywords = [kw.lower() for kw in ignore_data.get("keywords", [])]
 
-    def _normalize_text(self, text: str) -> str:
-        """テキストを正規化"""
-        # 小文字化
-        text = text.lower()
-        # ハイフン・アンダースコアをスペースに
-        text = re.sub(r"[-_]", " ", text)
-        # 複数スペースを単一に
-        text = re.sub(r"\s+", " ", text)
-        return text
-
-    def _count_keyword_matches(self, text: str, keywords: list[str]) -> tuple[int, list[str]]:
-        """キーワードマッチ数と該当キーワードを返す"""
-        text = self._normalize_text(text)
-        matched = []
-
-        for kw in keywords:
-            # キーワードが複数単語の場合はフレーズマッチ
-            if " " in kw:
-                if kw in text:
-                    matched.append(kw)
-            else:
-                # 単語境界でマッチ
-                pattern = rf"\b{re.escape(kw)}\b"
-                if re.search(pattern, text):
-                    matched.append(kw)
-
-        return len(matched), matched
+        # 照合用インデックスを構築（単語はトークン集合、フレーズはオートマトン）
+        self._category_index = _build_index(self.category_keywords)
+        self._ignore_index = _build_index({_IGNORE_GROUP: self.ignore_keywords})
+
+        # カテゴリ別ウェイトを定義順に固定（スコア計算は (カテゴリ, ウェイト) を 1 回なめるだけ）
+        self._category_weight_vector: list[tuple[Category, float]] = [
+            (category, self.category_weights.get(category, 1.0))
+            for category in self.category_keywords
+        ]
+
+    def _match_normalized(
+        self, text: str, tokens: set[str], index: _KeywordIndex
+    ) -> dict[Hashable, list[str]]:
+        """正規化済みテキストとそのトークン集合から、グループ別の該当キーワード（定義順）を返す"""
+        found: dict[Hashable, dict[int, str]] = {}
+
+        # 単語キーワード: トークン集合との積集合
+        for token in tokens.intersection(index.tokens):
+            for group, order, kw, _ in index.tokens[token]:
+                found.setdefault(group, {})[order] = kw
+
+        # フレーズ・記号入りキーワード: オートマトンで 1 パス走査
+        if len(index.automaton):
+            for end_idx, hits in index.automaton.iter(text):
+                for group, order, kw, word_bounded in hits:
+                    if word_bounded:
+                        # \b{kw}\b 相当: 前後の文字種が切り替わる位置のみ
+                        start_idx = end_idx - len(kw) + 1
+                        if _is_word_char(text, start_idx - 1) == _is_word_char(text, start_idx):
+                            continue
+                        if _is_word_char(text, end_idx) == _is_word_char(text, end_idx + 1):
+                            continue
+                    found.setdefault(group, {})[order] = kw
+
+        return {group: [kw for _, kw in sorted(hits.items())] for group, hits in found.items()}
 
     def classify(self, entry: CollectedEntry) -> ClassificationResult:
         """エントリを分類
@@ -118,11 +217,24 @@ class CategoryClassifier:
             分類結果
         """
         # 分類対象テキスト（タイトル + サマリ + 生コンテンツ）
-        text = f"{entry.title} {entry.summary} {entry.raw_content}"
+        # 正規化はフィールド毎に行い（大きな raw_content も一度正規化すればキャッシュが効く）、
+        # 正規化済みの断片を空白 1 つで連結する（全体を連結してから正規化した結果と同じ照合になる）
+        text = " ".join(
+            part
+            for part in (
+                _normalize(entry.title).strip(" "),
+                _normalize(entry.summary).strip(" "),
+                _normalize(entry.raw_content).strip(" "),
+            )
+            if part
+        )
+        tokens = set(_WORD_RE.findall(text))
 
         # 無視キーワードチェック
-        ignore_count, ignore_matched = self._count_keyword_matches(text, self.ignore_keywords)
-        if ignore_count >= 2:  # 2つ以上マッチで無視
+        ignore_matched = self._match_normalized(text, tokens, self._ignore_index).get(
+            _IGNORE_GROUP, []
+        )
+        if len(ignore_matched) >= 2:  # 2つ以上マッチで無視
             return ClassificationResult(
                 primary_category=Category.OTHER,
                 confidence=0.0,
@@ -133,16 +245,16 @@ class CategoryClassifier:
 
         # カテゴリ別スコア計算
         category_scores: dict[Category, float] = {}
-        all_matched: list[str] = []
+        all_matched: set[str] = set()
+
+        category_matches = self._match_normalized(text, tokens, self._category_index)
 
-        for category, keywords in self.category_keywords.items():
-            count, matched = self._count_keyword_matches(text, keywords)
-            if count > 0:
+        for category, weight in self._category_weight_vector:
+            matched = category_matches.get(category)
+            if matched:
                 # ウェイト適用
-                weight = self.category_weights.get(category, 1.0)
-                score = count * weight
-                category_scores[category] = score
-                all_matched.extend(matched)
+                category_scores[category] = len(matched) * weight
+                all_matched.update(matched)
 
         # スコアがない場合は OTHER
         if not category_scores:
@@ -150,7 +262,7 @@ class CategoryClassifier:
                 primary_category=Category.OTHER,
                 confidence=0.1,
                 matched_keywords=[],
-                category_scores={cat.value: 0.0 for cat in Category},
+                category_scores=dict.fromkeys((value for _, value in _CATEGORY_VALUES), 0.0),
             )
 
         # 最高スコアのカテゴリを選択
@@ -164,8 +276,10 @@ class CategoryClassifier:
         return ClassificationResult(
             primary_category=primary,
             confidence=confidence,
-            matched_keywords=list(set(all_matched)),
-            category_scores={cat.value: category_scores.get(cat, 0.0) for cat in Category},
+            matched_keywords=list(all_matched),
+            category_scores={
+                value: category_scores.get(cat, 0.0) for cat, value in _CATEGORY_VALUES
+            },
             is_ignored=False,
         )
 
@@ -1,19 +1,37 @@
 """
 AI Update Radar - 判断ログ出力
 
-評価結果を YAML 形式でログ出力する。
+評価結果をログ出力する。
+- 個別レコード: 日別 JSONL（{YYYYMMDD}.jsonl、1行1件で追記）
+- バッチサマリ / 個別ファイル指定時: YAML
 出力先: .private/logs/evaluations/
 """
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml なしでビルドされた PyYAML
+    from yaml import SafeDumper, SafeLoader
+
 from evaluators.relevance_scorer import EvaluationResult, Layer
 
 
+def _log_key(result: EvaluationResult) -> str:
+    """重複判定用キー（url・layer・decision の blake2b。hash() と違い実行をまたいで安定）"""
+    raw = f"{result.entry.url}|{result.layer.value}|{result.decision}"
+    return hashlib.blake2b(raw.encode(), digest_size=6).hexdigest()
+
+
 class EvaluationLogger:
     """評価結果のロガー"""
 
@@ -27,9 +45,18 @@ class EvaluationLogger:
 
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        # ファイル名 → (mtime_ns, パース済みレコード)。未更新ファイルの再パースを避ける
+        self._log_cache: dict[str, tuple[int, list[dict]]] = {}
+        # 日別 JSONL のファイル名 → 記録済みの重複判定キー
+        self._jsonl_keys: dict[str, set[str]] = {}
 
-    def _result_to_dict(self, result: EvaluationResult) -> dict:
-        """評価結果を辞書に変換"""
+    def _result_to_dict(self, result: EvaluationResult, now: datetime) -> dict:
+        """評価結果を辞書に変換
+
+        Args:
+            result: 評価結果
+            now: 記録時刻（1 回のログ出力内で共通の UTC 時刻）
+        """
         return {
             "entry": {
                 "title": result.entry.title,
@@ -58,32 +85,87 @@ class EvaluationLogger:
                 "reason": result.reason,
                 "next_action": result.next_action,
             },
-            "evaluated_at": datetime.now(timezone.utc).isoformat(),
+            "evaluated_at": now.isoformat(),
         }
 
-    def log_single(self, result: EvaluationResult) -> Path:
-        """単一の評価結果をログ
+    def _daily_path(self, now: datetime) -> Path:
+        """当日分の JSONL ログのパス（{YYYYMMDD}.jsonl、ローカル日付）"""
+        return self.log_dir / f"{now.astimezone().strftime('%Y%m%d')}.jsonl"
+
+    def _logged_keys(self, log_path: Path) -> set[str]:
+        """日別 JSONL に記録済みの重複判定キー（初回のみファイルから読み込み）"""
+        keys = self._jsonl_keys.get(log_path.name)
+        if keys is None:
+            keys = set()
+            if log_path.exists():
+                keys.update(
+                    record["log_key"]
+                    for record in self._read_log_file(log_path)
+                    if "log_key" in record
+                )
+            self._jsonl_keys[log_path.name] = keys
+        return keys
+
+    def _append_jsonl(self, results: list[EvaluationResult], now: datetime) -> Path:
+        """当日分の JSONL ログに 1 行 1 レコードで追記（同日に記録済みの結果はスキップ）"""
+        log_path = self._daily_path(now)
+        logged = self._logged_keys(log_path)
+
+        lines = []
+        for result in results:
+            key = _log_key(result)
+            if key in logged:
+                continue
+            logged.add(key)
+            record = self._result_to_dict(result, now)
+            record["log_key"] = key
+            lines.append(orjson.dumps(record) + b"\n")
+
+        if lines:
+            with open(log_path, "ab") as f:
+                f.write(b"".join(lines))
+        return log_path
 
-        Args:
-            result: 評価結果
+    def _write_yaml_log(self, result: EvaluationResult, now: datetime) -> Path:
+        """単一の評価結果を個別の YAML ファイルに書き出し（同日に記録済みなら既存パスを返す）"""
+        local_now = now.astimezone()
+        key = _log_key(result)
 
-        Returns:
-            ログファイルのパス
-        """
-        data = self._result_to_dict(result)
+        existing = next(self.log_dir.glob(f"{local_now:%Y%m%d}_*_{key}.yaml"), None)
+        if existing is not None:
+            return existing
+
+        data = self._result_to_dict(result, now)
 
-        # ファイル名: {date}_{layer}_{hash}.yaml
-        date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        url_hash = hash(result.entry.url) % 10000
-        filename = f"{date_str}_{result.layer.name.lower()}_{url_hash:04d}.yaml"
+        # ファイル名: {date}_{layer}_{key}.yaml
+        date_str = local_now.strftime("%Y%m%d_%H%M%S")
+        filename = f"{date_str}_{result.layer.name.lower()}_{key}.yaml"
 
         log_path = self.log_dir / filename
 
         with open(log_path, "w") as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                data,
+                f,
+                Dumper=SafeDumper,
+                allow_unicode=True,
+                default_flow_style=False,
+                sort_keys=False,
+            )
 
         return log_path
 
+    def log_single(self, result: EvaluationResult) -> Path:
+        """単一の評価結果をログ（当日分の JSONL に追記）
+
+        Args:
+            result: 評価結果
+
+        Returns:
+            ログファイルのパス
+        """
+        return self._append_jsonl([result], datetime.now(timezone.utc))
+
     def log_batch(self, results: list[EvaluationResult]) -> Path:
         """複数の評価結果をまとめてログ
 
@@ -96,6 +178,9 @@ class EvaluationLogger:
         if not results:
             return self.log_dir
 
+        # バッチ内の全レコードで同じ記録時刻を使う
+        now = datetime.now(timezone.utc)
+
         # レイヤー別に集計
         by_layer = {
             Layer.EXPERIMENT: [],
@@ -104,7 +189,7 @@ class EvaluationLogger:
         }
 
         for result in results:
-            by_layer[result.layer].append(self._result_to_dict(result))
+            by_layer[result.layer].append(self._result_to_dict(result, now))
 
         data = {
             "summary": {
@@ -112,7 +197,7 @@ class EvaluationLogger:
                 "experiment": len(by_layer[Layer.EXPERIMENT]),
                 "detect": len(by_layer[Layer.DETECT]),
                 "ignore": len(by_layer[Layer.IGNORE]),
-                "evaluated_at": datetime.now(timezone.utc).isoformat(),
+                "evaluated_at": now.isoformat(),
             },
             "experiment": by_layer[Layer.EXPERIMENT],
             "detect": by_layer[Layer.DETECT],
@@ -120,15 +205,69 @@ class EvaluationLogger:
         }
 
         # ファイル名
-        date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        date_str = now.astimezone().strftime("%Y%m%d_%H%M%S")
         filename = f"batch_{date_str}.yaml"
         log_path = self.log_dir / filename
 
         with open(log_path, "w") as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                data,
+                f,
+                Dumper=SafeDumper,
+                allow_unicode=True,
+                default_flow_style=False,
+                sort_keys=False,
+            )
 
         return log_path
 
+    def log_many(
+        self, results: list[EvaluationResult], single_files: bool = False
+    ) -> list[Path]:
+        """複数の評価結果を個別レコードとしてまとめてログ
+
+        Args:
+            results: 評価結果リスト
+            single_files: True なら 1 件ずつ個別の YAML ファイルを並列で書き出す。
+                          False なら当日分の JSONL に 1 回の open でまとめて追記する
+
+        Returns:
+            書き出したログファイルのパスリスト
+        """
+        if not results:
+            return []
+
+        # 全レコードで同じ記録時刻を使う
+        now = datetime.now(timezone.utc)
+
+        if single_files:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                return list(
+                    executor.map(lambda r: self._write_yaml_log(r, now), results)
+                )
+
+        return [self._append_jsonl(results, now)]
+
+    def _read_log_file(self, log_file: Path) -> list[dict]:
+        """ログファイルを読み込み（YAML は 1 ドキュメント、JSONL は 1 行 1 レコード）
+
+        mtime が前回読み込み時と同じならキャッシュ済みの結果を返す。
+        """
+        mtime = log_file.stat().st_mtime_ns
+        cached = self._log_cache.get(log_file.name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        if log_file.suffix == ".jsonl":
+            with open(log_file, "rb") as f:
+                records = [orjson.loads(line) for line in f if line.strip()]
+        else:
+            with open(log_file) as f:
+                records = [yaml.load(f, Loader=SafeLoader)]
+
+        self._log_cache[log_file.name] = (mtime, records)
+        return records
+
     def get_recent_logs(self, days: int = 7, layer: Optional[Layer] = None) -> list[dict]:
         """最近のログを取得
 
@@ -144,7 +283,9 @@ class EvaluationLogger:
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         results = []
 
-        for log_file in sorted(self.log_dir.glob("*.yaml"), reverse=True):
+        log_files = chain(self.log_dir.glob("*.yaml"), self.log_dir.glob("*.jsonl"))
+        # 日付付きファイル名は降順に並ぶため、cutoff より古いものが出たら以降は全て対象外
+        for log_file in sorted(log_files, reverse=True):
             # ファイル名から日付を推測
             try:
                 date_str = log_file.stem.split("_")[0]
@@ -152,14 +293,13 @@ class EvaluationLogger:
                     file_date = datetime.strptime(date_str, "%Y%m%d")
                     file_date = file_date.replace(tzinfo=timezone.utc)
                     if file_date < cutoff:
-                        continue
+                        break
             except (ValueError, IndexError):
                 continue
 
-            with open(log_file) as f:
-                data = yaml.safe_load(f)
-
-            if data:
+            for data in self._read_log_file(log_file):
+                if not data:
+                    continue
                 # バッチログの場合
                 if "summary" in data:
                     if layer:
@@ -276,9 +416,12 @@ if __name__ == "__main__":
     log_path = logger.log_batch(results)
     print(f"Batch log saved: {log_path}")
 
-    # 単一ログ
-    for result in results:
-        single_path = logger.log_single(result)
+    # 個別ログ（日別 JSONL に追記）
+    for jsonl_path in logger.log_many(results):
+        print(f"JSONL log saved: {jsonl_path}")
+
+    # 個別 YAML ファイル（並列書き出し）
+    for single_path in logger.log_many(results, single_files=True):
         print(f"Single log saved: {single_path}")
 
     # サマリレポート
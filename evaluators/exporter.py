@@ -9,14 +9,22 @@ AI Update Radar - エクスポーター
 - 技術アラート（YAML）
 """
 
-import json
+import hashlib
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+import ahocorasick
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # libyaml なしでビルドされた PyYAML
+    from yaml import SafeDumper
+
 from evaluators.relevance_scorer import EvaluationResult, Layer
 
 
@@ -36,9 +44,47 @@ class ExportConfig:
     ])
 
 
+def _write_yaml(path: Path, data: dict) -> None:
+    """YAML をメモリ上で UTF-8 にエンコードし、1 回の書き込みで保存"""
+    path.write_bytes(
+        yaml.dump(
+            data,
+            Dumper=SafeDumper,
+            allow_unicode=True,
+            default_flow_style=False,
+            sort_keys=False,
+            encoding="utf-8",
+        )
+    )
+
+
+def _empty_list_yaml(week: str, generated_at: str, key: str) -> str:
+    """項目が空のエクスポート YAML（yaml.dump と同じ出力を直接組み立てる）"""
+    return f"week: {week}\ngenerated_at: '{generated_at}'\n{key}: []\n"
+
+
+def _url_id(url: str) -> int:
+    """URL から実行をまたいで安定した 4 桁 ID を生成（hash() はプロセス毎にシードが変わる）"""
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=4).digest(), "big") % 10000
+
+
+def _keyword_pattern(keywords: list[str]) -> Optional[re.Pattern]:
+    """キーワードのいずれかを含むか判定する正規表現（キーワードなしなら None）"""
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(kw.lower()) for kw in keywords))
+
+
 class Exporter:
     """評価結果のエクスポーター"""
 
+    # 対象リポジトリ判定キーワード（上から順に判定）
+    TARGET_REPO_KEYWORDS = {
+        "infra-automation": ["mcp", "claude", "anthropic", "tool"],
+        "ScrimAutomationEngine": ["scrim", "fortnite", "esports", "tournament"],
+        "StreamFlowEngine": ["stream", "youtube", "twitch", "obs"],
+    }
+
     def __init__(self, config: Optional[ExportConfig] = None):
         """
         Args:
@@ -50,29 +96,52 @@ class Exporter:
 
         self.config = config
         self.config.exports_dir.mkdir(parents=True, exist_ok=True)
-
-    def _get_week_string(self) -> str:
-        """現在の週を YYYY-WXX 形式で取得"""
-        now = datetime.now(timezone.utc)
+        self._alert_re = _keyword_pattern(self.config.alert_keywords)
+        self._repo_automaton = self._build_repo_automaton()
+
+    def _build_repo_automaton(self) -> ahocorasick.Automaton:
+        """対象リポジトリ判定用オートマトン（値は (優先順位, リポジトリ名)）"""
+        automaton = ahocorasick.Automaton()
+        for priority, (repo, keywords) in enumerate(self.TARGET_REPO_KEYWORDS.items()):
+            for kw in keywords:
+                kw = kw.lower()
+                # 複数リポジトリに登録されたキーワードは優先順位の高い方を採用
+                if kw not in automaton:
+                    automaton.add_word(kw, (priority, repo))
+        if len(automaton):
+            automaton.make_automaton()
+        return automaton
+
+    def _get_week_string(self, now: Optional[datetime] = None) -> str:
+        """現在（または指定時刻）の週を YYYY-WXX 形式で取得"""
+        if now is None:
+            now = datetime.now(timezone.utc)
         return f"{now.year}-W{now.isocalendar()[1]:02d}"
 
+    @staticmethod
+    def _get_text(result: EvaluationResult) -> str:
+        """キーワード判定対象テキスト（タイトル + 要約の小文字）"""
+        return result.lowered_text or f"{result.entry.title} {result.entry.summary}".lower()
+
     def _is_alert_candidate(self, result: EvaluationResult) -> bool:
         """アラート候補かどうか判定"""
-        text = f"{result.entry.title} {result.entry.summary}".lower()
-        return any(kw.lower() in text for kw in self.config.alert_keywords)
+        if self._alert_re is None:
+            return False
+        return self._alert_re.search(self._get_text(result)) is not None
 
     def _determine_target_repo(self, result: EvaluationResult) -> str:
         """対象リポジトリを決定"""
-        text = f"{result.entry.title} {result.entry.summary}".lower()
-
-        if any(kw in text for kw in ["mcp", "claude", "anthropic", "tool"]):
+        if not len(self._repo_automaton):
             return "infra-automation"
-        elif any(kw in text for kw in ["scrim", "fortnite", "esports", "tournament"]):
-            return "ScrimAutomationEngine"
-        elif any(kw in text for kw in ["stream", "youtube", "twitch", "obs"]):
-            return "StreamFlowEngine"
-        else:
-            return "infra-automation"  # デフォルト
+
+        # マッチ位置ではなく TARGET_REPO_KEYWORDS の順序で優先する
+        best = None
+        for _, hit in self._repo_automaton.iter(self._get_text(result)):
+            if best is None or hit < best:
+                best = hit
+                if best[0] == 0:
+                    break
+        return best[1] if best is not None else "infra-automation"  # デフォルト
 
     def export_weekly_digest(
         self,
@@ -90,12 +159,16 @@ class Exporter:
         Returns:
             エクスポートファイルのパス
         """
-        week = self._get_week_string()
+        now = datetime.now(timezone.utc)
+        week = self._get_week_string(now)
 
-        # Layer 3 のハイライトを抽出
+        # レイヤー別件数の集計と Layer 3 のハイライト抽出を 1 パスで行う
+        layer_counts = dict.fromkeys(Layer, 0)
         highlights = []
+        min_layer = self.config.min_layer
         for result in results:
-            if result.layer.value >= self.config.min_layer.value:
+            layer_counts[result.layer] += 1
+            if result.layer >= min_layer:
                 highlights.append({
                     "title": result.entry.title,
                     "category": result.classification.primary_category.value,
@@ -107,12 +180,12 @@ class Exporter:
 
         digest = {
             "week": week,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": now.isoformat(),
             "summary": {
                 "total_evaluated": len(results),
-                "layer_3_count": sum(1 for r in results if r.layer == Layer.EXPERIMENT),
-                "layer_2_count": sum(1 for r in results if r.layer == Layer.DETECT),
-                "layer_1_count": sum(1 for r in results if r.layer == Layer.IGNORE),
+                "layer_3_count": layer_counts[Layer.EXPERIMENT],
+                "layer_2_count": layer_counts[Layer.DETECT],
+                "layer_1_count": layer_counts[Layer.IGNORE],
             },
             "highlights": highlights,
             "experiments_completed": experiments_completed or [],
@@ -121,8 +194,7 @@ class Exporter:
 
         # ファイル出力
         output_path = self.config.exports_dir / f"digest-{week}.json"
-        with open(output_path, "w") as f:
-            json.dump(digest, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(orjson.dumps(digest, option=orjson.OPT_INDENT_2))
 
         return output_path
 
@@ -135,14 +207,15 @@ class Exporter:
         Returns:
             エクスポートファイルのパス
         """
-        week = self._get_week_string()
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now(timezone.utc)
+        week = self._get_week_string(now)
+        date_str = now.astimezone().strftime("%Y-%m-%d")
 
         adopted_items = []
         for result in results:
             if result.relevance_score >= self.config.adoption_threshold:
                 adopted_items.append({
-                    "id": f"{date_str}-{hash(result.entry.url) % 10000:04d}",
+                    "id": f"{date_str}-{_url_id(result.entry.url):04d}",
                     "title": result.entry.title,
                     "target_repo": self._determine_target_repo(result),
                     "action": result.next_action,
@@ -153,13 +226,18 @@ class Exporter:
 
         data = {
             "week": week,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": now.isoformat(),
             "adopted": adopted_items,
         }
 
         output_path = self.config.exports_dir / f"adopted-{week}.yaml"
-        with open(output_path, "w") as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        if adopted_items:
+            _write_yaml(output_path, data)
+        else:
+            # 採用なしの週は yaml.dump を通さない
+            output_path.write_text(
+                _empty_list_yaml(week, data["generated_at"], "adopted"), encoding="utf-8"
+            )
 
         return output_path
 
@@ -172,13 +250,16 @@ class Exporter:
         Returns:
             エクスポートファイルのパス
         """
-        week = self._get_week_string()
+        now = datetime.now(timezone.utc)
+        week = self._get_week_string(now)
+        # 同一バッチで検出したアラートは同じ検出時刻を共有する
+        now_iso = now.isoformat()
 
         alerts = []
         for result in results:
             if self._is_alert_candidate(result):
                 # アラートタイプを推定
-                text = f"{result.entry.title} {result.entry.summary}".lower()
+                text = self._get_text(result)
                 if "breaking" in text or "deprecat" in text:
                     alert_type = "breaking_change"
                 elif "security" in text or "vulnerab" in text:
@@ -194,18 +275,21 @@ class Exporter:
                     "title": result.entry.title,
                     "message": result.entry.summary[:200] if result.entry.summary else "",
                     "url": result.entry.url,
-                    "detected_at": datetime.now(timezone.utc).isoformat(),
+                    "detected_at": now_iso,
                 })
 
         data = {
             "week": week,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": now_iso,
             "alerts": alerts,
         }
 
         output_path = self.config.exports_dir / f"alerts-{week}.yaml"
-        with open(output_path, "w") as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        if alerts:
+            _write_yaml(output_path, data)
+        else:
+            # アラートなしの週は yaml.dump を通さない
+            output_path.write_text(_empty_list_yaml(week, now_iso, "alerts"), encoding="utf-8")
 
         return output_path
 
@@ -9,11 +9,15 @@ AI Update Radar - 関連性スコアラー
 - urgency: 緊急性（競合優位性に影響するか）
 """
 
+import hashlib
+from collections import Counter
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
 from typing import Optional
 
+import ahocorasick
+
 from collectors.models import Category, CollectedEntry
 from evaluators.category_classifier import CategoryClassifier, ClassificationResult
 
@@ -59,11 +63,16 @@ class EvaluationResult:
     decision: str  # ignore / detect / experiment
     reason: str = ""
     next_action: str = ""
+    # タイトル + 要約の小文字（エクスポート時のキーワード判定で再利用）
+    lowered_text: str = ""
 
 
 class RelevanceScorer:
     """関連性スコアラー"""
 
+    # 分類・スコアリング結果のキャッシュ上限（件数）
+    CACHE_SIZE = 8192
+
     # カテゴリ別ベーススコア（重要度の基本値）
     CATEGORY_BASE_SCORES = {
         Category.CAPABILITY: {"applicability": 6, "cost_reduction": 5, "urgency": 7},
@@ -72,6 +81,25 @@ class RelevanceScorer:
         Category.OTHER: {"applicability": 3, "cost_reduction": 2, "urgency": 2},
     }
 
+    # スコアリング対象の属性
+    SCORE_ATTRS = ("applicability", "cost_reduction", "risk", "urgency")
+
+    # 評価理由に使うカテゴリ説明
+    CATEGORY_DESCRIPTIONS = {
+        Category.CAPABILITY: "能力変化",
+        Category.CONSTRAINT: "制限解除",
+        Category.PRICING: "価格変化",
+        Category.OTHER: "その他",
+    }
+
+    # 評価理由に記載するスコアリングのハイライト（属性, 説明）。7 以上で記載
+    REASON_HIGHLIGHTS = (
+        ("applicability", "直接適用可能性が高い"),
+        ("cost_reduction", "コスト削減効果が見込める"),
+        ("urgency", "緊急性が高い"),
+        ("risk", "導入リスクが低い"),
+    )
+
     # 高評価キーワード（マッチするとスコア加算）
     HIGH_IMPACT_KEYWORDS = {
         # 直接適用可能性を高める
@@ -132,57 +160,125 @@ class RelevanceScorer:
             keywords_path: keywords.yaml のパス
         """
         self.classifier = classifier or CategoryClassifier(keywords_path)
+        self._keyword_automaton = self._build_keyword_automaton()
+        # カテゴリ → SCORE_ATTRS 順のベーススコア（未定義の属性は 5）
+        self._base_scores = {
+            category: tuple(base.get(attr, 5) for attr in self.SCORE_ATTRS)
+            for category, base in self.CATEGORY_BASE_SCORES.items()
+        }
+        # (url, 内容ハッシュ) → (分類結果, スコアリング内訳, 評価理由)。再評価時の重複計算を避ける
+        self._cache: dict[
+            tuple[str, bytes], tuple[ClassificationResult, ScoringBreakdown, str]
+        ] = {}
+
+    def _get_text(self, entry: CollectedEntry, lowered_text: Optional[str] = None) -> str:
+        """エントリからスコアリング対象テキストを取得
 
-    def _get_text(self, entry: CollectedEntry) -> str:
-        """エントリからスコアリング対象テキストを取得"""
-        return f"{entry.title} {entry.summary} {entry.raw_content}".lower()
+        Args:
+            entry: 対象エントリ
+            lowered_text: 計算済みのタイトル + 要約の小文字（省略時は再計算）
+        """
+        if lowered_text is None:
+            lowered_text = f"{entry.title} {entry.summary}".lower()
+        return f"{lowered_text} {entry.raw_content.lower()}"
+
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """高評価/低評価キーワードを 1 つの Aho-Corasick オートマトンにまとめる
+
+        値は (キーワード, [(属性, 符号), ...])。符号は高評価 +1、低評価 -1。
+        """
+        automaton = ahocorasick.Automaton()
+        for sign, groups in ((1, self.HIGH_IMPACT_KEYWORDS), (-1, self.LOW_IMPACT_KEYWORDS)):
+            for attr, keywords in groups.items():
+                for kw in keywords:
+                    kw = kw.lower()
+                    if kw not in automaton:
+                        automaton.add_word(kw, (kw, []))
+                    automaton.get(kw)[1].append((attr, sign))
+        if len(automaton):
+            automaton.make_automaton()
+        return automaton
+
+    def _count_keyword_matches(self, text: str) -> Counter[tuple[str, int]]:
+        """(属性, 符号) ごとのキーワードマッチ数をカウント
+
+        テキストを 1 回走査し、同じキーワードの複数出現は 1 件として数える。
+        """
+        counts: Counter[tuple[str, int]] = Counter()
+        if not len(self._keyword_automaton):
+            return counts
 
-    def _count_keyword_matches(self, text: str, keywords: list[str]) -> int:
-        """キーワードマッチ数をカウント"""
-        count = 0
-        for kw in keywords:
-            if kw.lower() in text:
-                count += 1
-        return count
+        matched = {kw: targets for _, (kw, targets) in self._keyword_automaton.iter(text)}
+        for targets in matched.values():
+            counts.update(targets)
+        return counts
 
     def _calculate_scores(
-        self, entry: CollectedEntry, classification: ClassificationResult
+        self,
+        entry: CollectedEntry,
+        classification: ClassificationResult,
+        lowered_text: Optional[str] = None,
     ) -> ScoringBreakdown:
         """スコアリング内訳を計算"""
-        text = self._get_text(entry)
+        text = self._get_text(entry, lowered_text)
 
-        # ベーススコア取得
-        base = self.CATEGORY_BASE_SCORES.get(
-            classification.primary_category,
-            {"applicability": 5, "cost_reduction": 5, "urgency": 5},
+        # ベーススコア取得（未定義カテゴリは全属性 5）
+        base = self._base_scores.get(
+            classification.primary_category, (5,) * len(self.SCORE_ATTRS)
         )
 
         # 各要素のスコア計算
-        scores = ScoringBreakdown()
+        scores = {}
+        matches = self._count_keyword_matches(text)
+        # 分類信頼度による調整係数（属性によらず一定）
+        factor = 0.7 + 0.3 * classification.confidence
 
-        for attr in ["applicability", "cost_reduction", "risk", "urgency"]:
-            # ベーススコア
-            score = base.get(attr, 5)
+        for attr, score in zip(self.SCORE_ATTRS, base):
 
             # 高評価キーワードでプラス
-            high_matches = self._count_keyword_matches(
-                text, self.HIGH_IMPACT_KEYWORDS.get(attr, [])
-            )
+            high_matches = matches[(attr, 1)]
             score += min(high_matches * 2, 4)  # 最大+4
 
             # 低評価キーワードでマイナス
-            low_matches = self._count_keyword_matches(
-                text, self.LOW_IMPACT_KEYWORDS.get(attr, [])
-            )
+            low_matches = matches[(attr, -1)]
             score -= min(low_matches * 2, 4)  # 最大-4
 
             # 分類信頼度による調整
-            score = int(score * (0.7 + 0.3 * classification.confidence))
+            score = int(score * factor)
 
             # 0-10 にクランプ
-            setattr(scores, attr, max(0, min(10, score)))
+            scores[attr] = max(0, min(10, score))
+
+        return ScoringBreakdown(**scores)
+
+    @staticmethod
+    def _cache_key(entry: CollectedEntry) -> tuple[str, bytes]:
+        """キャッシュキー（url と分類・スコアリング対象テキストの blake2b）"""
+        content = "\x1f".join((entry.title, entry.summary, entry.raw_content))
+        return entry.url, hashlib.blake2b(content.encode(), digest_size=8).digest()
+
+    def _classify_and_score(
+        self, entry: CollectedEntry, lowered_text: str
+    ) -> tuple[ClassificationResult, ScoringBreakdown, str]:
+        """分類・スコアリング・評価理由の生成（同じ内容のエントリはキャッシュから返す）"""
+        key = self._cache_key(entry)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        classification = self.classifier.classify(entry)
+        if classification.is_ignored:
+            scoring = ScoringBreakdown()
+        else:
+            scoring = self._calculate_scores(entry, classification, lowered_text)
+        layer = self._determine_layer(scoring.total, classification.is_ignored)
+        reason = self._generate_reason(entry, classification, scoring, layer)
 
-        return scores
+        if len(self._cache) >= self.CACHE_SIZE:
+            # 最も古いエントリを捨てる（dict は挿入順）
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (classification, scoring, reason)
+        return classification, scoring, reason
 
     def _determine_layer(self, score: float, is_ignored: bool) -> Layer:
         """スコアからレイヤーを決定"""
@@ -207,26 +303,14 @@ class RelevanceScorer:
         if classification.is_ignored:
             return f"無視キーワード検出: {', '.join(classification.matched_keywords[:3])}"
 
-        reasons = []
-
         # カテゴリ説明
-        cat_desc = {
-            Category.CAPABILITY: "能力変化",
-            Category.CONSTRAINT: "制限解除",
-            Category.PRICING: "価格変化",
-            Category.OTHER: "その他",
-        }
-        reasons.append(f"カテゴリ: {cat_desc.get(classification.primary_category, '不明')}")
+        cat_desc = self.CATEGORY_DESCRIPTIONS.get(classification.primary_category, "不明")
+        reasons = [f"カテゴリ: {cat_desc}"]
 
         # スコアリングのハイライト
-        if scoring.applicability >= 7:
-            reasons.append("直接適用可能性が高い")
-        if scoring.cost_reduction >= 7:
-            reasons.append("コスト削減効果が見込める")
-        if scoring.urgency >= 7:
-            reasons.append("緊急性が高い")
-        if scoring.risk >= 7:
-            reasons.append("導入リスクが低い")
+        reasons.extend(
+            desc for attr, desc in self.REASON_HIGHLIGHTS if getattr(scoring, attr) >= 7
+        )
 
         # マッチしたキーワード
         if classification.matched_keywords:
@@ -263,26 +347,24 @@ class RelevanceScorer:
         Returns:
             評価結果
         """
-        # カテゴリ分類
-        classification = self.classifier.classify(entry)
+        # カテゴリ分類・スコアリング
+        lowered_text = f"{entry.title} {entry.summary}".lower()
+        classification, scoring, reason = self._classify_and_score(entry, lowered_text)
 
         # 無視対象の場合
         if classification.is_ignored:
             return EvaluationResult(
                 entry=entry,
                 classification=classification,
-                scoring=ScoringBreakdown(),
+                scoring=scoring,
                 layer=Layer.IGNORE,
                 relevance_score=0.0,
                 decision="ignore",
-                reason=self._generate_reason(
-                    entry, classification, ScoringBreakdown(), Layer.IGNORE
-                ),
+                reason=reason,
                 next_action="なし",
+                lowered_text=lowered_text,
             )
 
-        # スコアリング
-        scoring = self._calculate_scores(entry, classification)
         relevance_score = scoring.total
 
         # レイヤー判定
@@ -302,12 +384,18 @@ class RelevanceScorer:
             layer=layer,
             relevance_score=relevance_score,
             decision=decision,
-            reason=self._generate_reason(entry, classification, scoring, layer),
+            reason=reason,
             next_action=self._suggest_next_action(entry, layer, classification),
+            lowered_text=lowered_text,
         )
 
     def evaluate_batch(self, entries: list[CollectedEntry]) -> list[EvaluationResult]:
-        """複数エントリを一括評価"""
+        """複数エントリを一括評価
+
+        開始時に keywords.yaml の更新を確認し、更新されていればキャッシュを破棄する。
+        """
+        if self.classifier.refresh_keywords():
+            self._cache.clear()
         return [self.evaluate(entry) for entry in entries]
 
 
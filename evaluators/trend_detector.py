@@ -4,18 +4,38 @@
 キーワード頻度の変化からトレンドを検出
 """
 
-import json
+import heapq
 from collections import Counter
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import ahocorasick
+import orjson
 import yaml
 
+# 日ごとの集計（counts-YYYY-MM-DD.json）の形式。_extract_keywords の集計方法を変えたら上げる
+_COUNTS_VERSION = 1
+
 
 class TrendDetector:
     """キーワード監視とトレンド検知"""
 
+    # タイトルから抽出する AI 関連キーワード
+    AI_KEYWORDS = [
+        "AI",
+        "LLM",
+        "GPT",
+        "Claude",
+        "Agent",
+        "MCP",
+        "RAG",
+        "embedding",
+        "fine-tuning",
+        "prompt",
+        "automation",
+    ]
+
     def __init__(
         self,
         data_dir: Path,
@@ -32,78 +52,213 @@ class TrendDetector:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.threshold_ratio = threshold_ratio
+        self._ai_keyword_automaton = self._build_ai_keyword_automaton()
+        # (ディレクトリ mtime_ns, 日付 → ファイル一覧)。ファイル追加・削除時のみ再走査
+        self._manifest: Optional[tuple[int, dict[date, list[Path]]]] = None
+        # ファイル → (mtime_ns, エントリ一覧)。未更新ファイルの再パースを避ける
+        self._entries_cache: dict[Path, tuple[int, list[dict]]] = {}
+
+    def _build_ai_keyword_automaton(self) -> ahocorasick.Automaton:
+        """AI_KEYWORDS を小文字で登録した Aho-Corasick オートマトン（値は (定義順, キーワード)）"""
+        automaton = ahocorasick.Automaton()
+        for idx, kw in enumerate(self.AI_KEYWORDS):
+            automaton.add_word(kw.lower(), (idx, kw))
+        if len(automaton):
+            automaton.make_automaton()
+        return automaton
+
+    def _match_ai_keywords(self, title: str) -> list[str]:
+        """タイトルに部分一致する AI キーワードを定義順で返す（大文字小文字は無視）"""
+        if not len(self._ai_keyword_automaton):
+            return []
+        matched = {value for _, value in self._ai_keyword_automaton.iter(title.lower())}
+        return [kw for _, kw in sorted(matched)]
+
+    def _get_manifest(self, competitors_dir: Path) -> dict[date, list[Path]]:
+        """日付 → competitor-*.json のマニフェストを取得（ディレクトリ更新時のみ再構築）"""
+        mtime = competitors_dir.stat().st_mtime_ns
+        if self._manifest is not None and self._manifest[0] == mtime:
+            return self._manifest[1]
+
+        manifest: dict[date, list[Path]] = {}
+        for json_file in competitors_dir.glob("competitor-*.json"):
+            # ファイル名から日付を抽出
+            date_str = json_file.stem.replace("competitor-", "")
+            try:
+                file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            manifest.setdefault(file_date, []).append(json_file)
+
+        self._manifest = (mtime, manifest)
+        return manifest
+
+    def _read_entries(self, json_file: Path) -> list[dict]:
+        """competitor-*.json のエントリを読み込み（mtime が変わらなければキャッシュを返す）"""
+        mtime = json_file.stat().st_mtime_ns
+        cached = self._entries_cache.get(json_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
 
-    def _load_entries_for_period(
+        entries = []
+        try:
+            data = orjson.loads(json_file.read_bytes())
+            for result in data.get("results", []):
+                entries.extend(result.get("entries", []))
+        except orjson.JSONDecodeError:
+            entries = []
+
+        self._entries_cache[json_file] = (mtime, entries)
+        return entries
+
+    def _period_days(
         self, start_date: datetime, end_date: datetime
-    ) -> list[dict]:
+    ) -> list[tuple[date, list[Path]]]:
         """
-        指定期間のエントリを読み込み
+        指定期間の日付と、その日の competitor-*.json を日付順に取得
 
         Args:
             start_date: 開始日
             end_date: 終了日
 
         Returns:
-            list[dict]: エントリリスト
+            list[tuple[date, list[Path]]]: (日付, 対象ファイル) のリスト（ファイルがある日のみ）
         """
-        entries = []
-
-        # competitors ディレクトリからファイルを読み込み
+        days: list[tuple[date, list[Path]]] = []
         competitors_dir = self.data_dir / "competitors"
         if competitors_dir.exists():
-            for json_file in competitors_dir.glob("competitor-*.json"):
-                # ファイル名から日付を抽出
-                date_str = json_file.stem.replace("competitor-", "")
-                try:
-                    file_date = datetime.strptime(date_str, "%Y-%m-%d").replace(
-                        tzinfo=timezone.utc
-                    )
-                    if start_date <= file_date <= end_date:
-                        with open(json_file, encoding="utf-8") as f:
-                            data = json.load(f)
-                            for result in data.get("results", []):
-                                entries.extend(result.get("entries", []))
-                except (ValueError, json.JSONDecodeError):
-                    continue
+            manifest = self._get_manifest(competitors_dir)
+            day = start_date.astimezone(timezone.utc).date()
+            last_day = end_date.astimezone(timezone.utc).date()
+            while day <= last_day:
+                file_date = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+                if start_date <= file_date <= end_date and day in manifest:
+                    days.append((day, manifest[day]))
+                day += timedelta(days=1)
+        return days
+
+    def _period_files(self, start_date: datetime, end_date: datetime) -> list[Path]:
+        """
+        指定期間の日付の competitor-*.json を日付順に取得
 
-        return entries
+        Args:
+            start_date: 開始日
+            end_date: 終了日
+
+        Returns:
+            list[Path]: 対象ファイル
+        """
+        return [f for _, files in self._period_days(start_date, end_date) for f in files]
 
-    def _extract_keywords(self, entries: list[dict]) -> Counter:
+    def _load_entries_for_period(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[dict]:
+        """
+        指定期間のエントリを順に返す（リストに集めずストリーミング）
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日
+
+        Yields:
+            dict: エントリ
+        """
+        for json_file in self._period_files(start_date, end_date):
+            yield from self._read_entries(json_file)
+
+    def _count_period(self, start_date: datetime, end_date: datetime) -> tuple[Counter, int]:
+        """
+        指定期間のキーワード集計（日ごとの集計を合算）
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日
+
+        Returns:
+            tuple[Counter, int]: キーワード出現回数とエントリ数
+        """
+        counts: Counter = Counter()
+        entries_count = 0
+        for day, files in self._period_days(start_date, end_date):
+            day_counts, day_entries_count = self._count_day(day, files)
+            counts.update(day_counts)
+            entries_count += day_entries_count
+        return counts, entries_count
+
+    def _count_day(self, day: date, files: list[Path]) -> tuple[Counter, int]:
+        """
+        1 日分のキーワード集計
+
+        終了済みの日は集計結果を output_dir/counts/counts-YYYY-MM-DD.json に保存し、
+        入力ファイルの mtime・AI_KEYWORDS・集計方法（_COUNTS_VERSION）が変わっていなければ
+        次回以降はファイルを読まずに再利用する。
+        日付単位で保存するので、集計期間がずれても同じファイルを使い回せる。
+
+        Args:
+            day: 対象日（UTC）
+            files: その日の competitor-*.json
+
+        Returns:
+            tuple[Counter, int]: キーワード出現回数とエントリ数
+        """
+        entries = (entry for f in files for entry in self._read_entries(f))
+        day_end = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=1)
+        if day_end > datetime.now(timezone.utc):
+            return self._extract_keywords(entries)
+
+        fingerprint = {f.name: f.stat().st_mtime_ns for f in files}
+        keywords = list(self.AI_KEYWORDS)
+        sidecar = self.output_dir / "counts" / f"counts-{day.isoformat()}.json"
+
+        if sidecar.exists():
+            try:
+                cached = orjson.loads(sidecar.read_bytes())
+                if (
+                    cached["files"] == fingerprint
+                    and cached["keywords"] == keywords
+                    and cached["version"] == _COUNTS_VERSION
+                ):
+                    return Counter(cached["counts"]), cached["entries_count"]
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                pass
+
+        counts, entries_count = self._extract_keywords(entries)
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        sidecar.write_bytes(
+            orjson.dumps(
+                {
+                    "version": _COUNTS_VERSION,
+                    "keywords": keywords,
+                    "files": fingerprint,
+                    "entries_count": entries_count,
+                    "counts": counts,
+                }
+            )
+        )
+        return counts, entries_count
+
+    def _extract_keywords(self, entries: Iterable[dict]) -> tuple[Counter, int]:
         """
         エントリからキーワードを抽出してカウント
 
         Args:
-            entries: エントリリスト
+            entries: エントリのイテラブル（1 回だけ走査する）
 
         Returns:
-            Counter: キーワード出現回数
+            tuple[Counter, int]: キーワード出現回数とエントリ数
         """
-        keywords = []
+        counts: Counter = Counter()
+        entries_count = 0
         for entry in entries:
+            entries_count += 1
             # 明示的なキーワード
-            keywords.extend(entry.get("keywords", []))
+            counts.update(entry.get("keywords", []))
 
             # タイトルから重要語を抽出（簡易版）
-            title = entry.get("title", "")
-            # AI関連キーワードをチェック
-            ai_keywords = [
-                "AI",
-                "LLM",
-                "GPT",
-                "Claude",
-                "Agent",
-                "MCP",
-                "RAG",
-                "embedding",
-                "fine-tuning",
-                "prompt",
-                "automation",
-            ]
-            for kw in ai_keywords:
-                if kw.lower() in title.lower():
-                    keywords.append(kw)
-
-        return Counter(keywords)
+            # AI関連キーワードをチェック（タイトルを 1 回走査）
+            counts.update(self._match_ai_keywords(entry.get("title", "")))
+
+        return counts, entries_count
 
     def detect_trends(
         self,
@@ -125,15 +280,11 @@ class TrendDetector:
         prev_week_start = current_week_start - timedelta(days=7)
         prev_week_end = current_week_start
 
-        # 各期間のエントリを取得
-        current_entries = self._load_entries_for_period(
+        # 各期間のキーワードカウント（終了済みの期間は保存済みの集計を再利用）
+        current_counts, current_entries_count = self._count_period(
             current_week_start, current_week_end
         )
-        prev_entries = self._load_entries_for_period(prev_week_start, prev_week_end)
-
-        # キーワードカウント
-        current_counts = self._extract_keywords(current_entries)
-        prev_counts = self._extract_keywords(prev_entries)
+        prev_counts, prev_entries_count = self._count_period(prev_week_start, prev_week_end)
 
         # トレンド判定
         rising_trends = []
@@ -177,12 +328,13 @@ class TrendDetector:
                     trend_data["change"] = "stable"
                     stable_trends.append(trend_data)
 
-        # スコア順でソート
-        rising_trends.sort(
+        # スコア順の上位10件だけを選ぶ（全件ソートしない）
+        top_rising = heapq.nlargest(
+            10,
+            rising_trends,
             key=lambda x: (x["ratio"] if x["ratio"] != float("inf") else 999),
-            reverse=True,
         )
-        declining_trends.sort(key=lambda x: x["ratio"])
+        top_declining = heapq.nsmallest(10, declining_trends, key=lambda x: x["ratio"])
 
         result = {
             "analyzed_at": datetime.now(timezone.utc).isoformat(),
@@ -190,17 +342,17 @@ class TrendDetector:
                 "current": {
                     "start": current_week_start.isoformat(),
                     "end": current_week_end.isoformat(),
-                    "entries_count": len(current_entries),
+                    "entries_count": current_entries_count,
                 },
                 "previous": {
                     "start": prev_week_start.isoformat(),
                     "end": prev_week_end.isoformat(),
-                    "entries_count": len(prev_entries),
+                    "entries_count": prev_entries_count,
                 },
             },
             "trends": {
-                "rising": rising_trends[:10],  # 上位10件
-                "declining": declining_trends[:10],
+                "rising": top_rising,  # 上位10件
+                "declining": top_declining,
                 "stable_count": len(stable_trends),
             },
             "summary": {
@@ -227,8 +379,7 @@ class TrendDetector:
         filename = f"trends-{week_num}.json"
         output_path = self.output_dir / filename
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(trends, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(orjson.dumps(trends, option=orjson.OPT_INDENT_2))
 
         return output_path
 
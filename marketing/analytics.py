@@ -4,10 +4,65 @@
 公開コンテンツのパフォーマンスを追跡
 """
 
-import json
+import heapq
+import os
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows など
+    fcntl = None
+
+# メトリクス未登録の投稿用（集計ループで空 dict を毎回作らないための読み取り専用の共有値）
+_EMPTY_METRICS = MappingProxyType({})
+
+# 投稿間で値の種類が少なく、集計時の比較・dict キーに使うフィールド
+_INTERNED_FIELDS = ("platform", "content_type", "week")
+
+
+def _intern_fields(post: dict) -> dict:
+    """集計で使う文字列フィールドを intern して同じ値を 1 つのオブジェクトに共有"""
+    for field in _INTERNED_FIELDS:
+        value = post.get(field)
+        if isinstance(value, str):
+            post[field] = sys.intern(value)
+    return post
+
+
+def _prepare_post(post: dict) -> dict:
+    """
+    キャッシュに載せる投稿を整える
+
+    文字列フィールドを intern し、published_ts を持たない旧データは
+    published_at を一度だけパースして補完する（パースできなければ補完しない）。
+    """
+    _intern_fields(post)
+    if "published_ts" not in post:
+        try:
+            post["published_ts"] = datetime.fromisoformat(post["published_at"]).timestamp()
+        except (ValueError, KeyError, TypeError):
+            pass
+    return post
+
+
+def _public_copy(post: dict) -> dict:
+    """
+    呼び出し側に返す投稿のコピー
+
+    キャッシュ上の投稿を書き換えられないよう metrics まで複製し、
+    内部用の published_ts は除く。
+    """
+    copy = dict(post, metrics=dict(post.get("metrics") or {}))
+    copy.pop("published_ts", None)
+    return copy
 
 
 class AnalyticsTracker:
@@ -16,6 +71,11 @@ class AnalyticsTracker:
 
     X Analytics / Note / ブログ等の外部ツールと連携し、
     投稿パフォーマンスを追跡する
+
+    更新は追記専用のイベントログ（performance.jsonl）に 1 行ずつ書き込み、
+    close() でスナップショット（performance.json）に畳み込む。
+    同じデータディレクトリを複数のインスタンスで共有でき、
+    読み取りのたびに他のインスタンスの追記に追従する。
     """
 
     def __init__(self, data_dir: Path):
@@ -25,25 +85,175 @@ class AnalyticsTracker:
         """
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # 投稿 ID → 投稿データ（スナップショット + イベントログから構築し、読むたびに追従）
+        self._cache: Optional[dict[str, dict]] = None
+        # キャッシュ構築に使ったスナップショットの識別情報と、反映済みのログのバイト数
+        self._snapshot_sig: Optional[tuple[int, int, int]] = None
+        self._log_offset = 0
+        self._log_fh: Optional[BinaryIO] = None
+        self._lock_fh: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "AnalyticsTracker":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _get_data_path(self) -> Path:
-        """データファイルのパス"""
+        """データファイル（スナップショット）のパス"""
         return self.data_dir / "performance.json"
 
+    def _get_log_path(self) -> Path:
+        """追記専用イベントログのパス"""
+        return self.data_dir / "performance.jsonl"
+
+    def _get_lock_path(self) -> Path:
+        """スナップショットとイベントログの更新を排他するロックファイルのパス"""
+        return self.data_dir / "performance.lock"
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """
+        同じデータディレクトリを使う他のインスタンス・プロセスと排他する
+
+        追記・畳み込みは排他ロック、読み取りは共有ロックで行う。
+        fcntl がない環境ではロックしない。
+        """
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fh is None:
+            self._lock_fh = open(self._get_lock_path(), "ab")
+        fd = self._lock_fh.fileno()
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
     def _load_data(self) -> dict:
-        """パフォーマンスデータを読み込み"""
+        """パフォーマンスデータを読み込み
+
+        投稿は {"posts_by_id": {投稿ID: 投稿}} 形式で返す。
+        旧形式（"posts" のリスト）のファイルはこの形式に変換する。
+        """
         data_path = self._get_data_path()
-        if data_path.exists():
-            with open(data_path, encoding="utf-8") as f:
-                return json.load(f)
-        return {"posts": [], "summary": {}}
+        if not data_path.exists():
+            return {"posts_by_id": {}, "summary": {}}
+
+        # 1 回の read でまとめて読み込み
+        data = orjson.loads(data_path.read_bytes())
+        if "posts" in data:
+            legacy_posts = data.pop("posts")
+            posts_by_id = data.setdefault("posts_by_id", {})
+            for post in legacy_posts:
+                posts_by_id[post["id"]] = post
+        data.setdefault("posts_by_id", {})
+        return data
 
     def _save_data(self, data: dict) -> None:
         """パフォーマンスデータを保存"""
         data_path = self._get_data_path()
         data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        with open(data_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # メモリ上でシリアライズし、tmp に 1 回の write で書いてから原子的に置換
+        tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, data_path)
+
+    def _snapshot_signature(self) -> Optional[tuple[int, int, int]]:
+        """スナップショットの (inode, mtime, サイズ)。置換・更新されると変わる"""
+        try:
+            st = self._get_data_path().stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _ensure_loaded(self) -> dict[str, dict]:
+        """
+        投稿キャッシュを取得
+
+        他のインスタンスが追記したイベントログの末尾を毎回反映する。
+        スナップショットが置き換えられた（他のインスタンスが畳み込んだ）場合は
+        スナップショットから作り直す。呼び出し側でロックを取っておくこと。
+        """
+        log_path = self._get_log_path()
+        try:
+            log_size = log_path.stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+
+        snapshot_sig = self._snapshot_signature()
+        if self._cache is None or snapshot_sig != self._snapshot_sig or log_size < self._log_offset:
+            cache = self._load_data()["posts_by_id"]
+            for post in cache.values():
+                _prepare_post(post)
+            self._cache = cache
+            self._snapshot_sig = snapshot_sig
+            self._log_offset = 0
+
+        if log_size > self._log_offset:
+            with open(log_path, "rb") as f:
+                f.seek(self._log_offset)
+                chunk = f.read(log_size - self._log_offset)
+            # 改行で終わっていない末尾（書き込み途中の行）は次回に回す
+            end = chunk.rfind(b"\n") + 1
+            # イベントログは各行が更新後の投稿全体なので、後勝ちで上書きすればよい
+            for line in chunk[:end].splitlines():
+                try:
+                    post = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # 書き込み途中で中断された行など
+                    continue
+                self._cache[post["id"]] = _prepare_post(post)
+            self._log_offset += end
+
+        return self._cache
+
+    def _append_events(self, posts: list[dict]) -> None:
+        """
+        更新後の投稿をイベントログに追記（まとめて 1 回の write）
+
+        呼び出し側で排他ロックを取り、直前に _ensure_loaded で追従しておくこと。
+        """
+        if not posts:
+            return
+        if self._log_fh is None:
+            self._log_fh = open(self._get_log_path(), "a+b")
+        fh = self._log_fh
+
+        payload = b"".join(orjson.dumps(post) + b"\n" for post in posts)
+        size = os.fstat(fh.fileno()).st_size
+        if size:
+            # 中断された書き込みで改行なしの行が残っていたら、新しい行を連結させない
+            fh.seek(size - 1)
+            if fh.read(1) != b"\n":
+                payload = b"\n" + payload
+        fh.write(payload)
+        fh.flush()
+        # 追記した分は反映済み（直前に追従済みで、ロック中に他の追記はない）
+        self._log_offset = size + len(payload)
+
+    def close(self) -> None:
+        """イベントログをスナップショットに畳み込み、ログを空にする"""
+        try:
+            with self._locked(exclusive=True):
+                log_path = self._get_log_path()
+                if log_path.exists() and log_path.stat().st_size > 0:
+                    # ディスク上のログ全体に追従してから畳み込む
+                    posts = self._ensure_loaded()
+                    data = self._load_data()
+                    data["posts_by_id"] = posts
+                    self._save_data(data)
+                    # 他のインスタンスが開いたままのログを指せるよう、削除せず切り詰める
+                    os.truncate(log_path, 0)
+                    self._snapshot_sig = self._snapshot_signature()
+                    self._log_offset = 0
+        finally:
+            for fh in (self._log_fh, self._lock_fh):
+                if fh is not None:
+                    fh.close()
+            self._log_fh = None
+            self._lock_fh = None
 
     def record_post(
         self,
@@ -68,32 +278,87 @@ class AnalyticsTracker:
         Returns:
             dict: 記録した投稿データ
         """
-        data = self._load_data()
+        # 他のインスタンスの追記に追従してから更新し、続けて追記する
+        with self._locked(exclusive=True):
+            post, stored = self._upsert_post(
+                datetime.now(timezone.utc),
+                platform=platform,
+                post_id=post_id,
+                content_type=content_type,
+                week=week,
+                url=url,
+                published_at=published_at,
+            )
+            self._append_events([stored])
+        return _public_copy(post)
+
+    def record_posts(self, posts: Iterable[dict]) -> list[dict]:
+        """
+        複数の投稿をまとめて記録（イベントログへの書き込みは 1 回）
+
+        Args:
+            posts: record_post の引数（platform, post_id, content_type, week,
+                url, published_at）を持つ dict の列
+
+        Returns:
+            list[dict]: 記録した投稿データ（入力順）
+        """
+        now = datetime.now(timezone.utc)
+        recorded = []
+        stored_posts = {}
+        # 他のインスタンスの追記に追従してから更新し、続けて追記する
+        with self._locked(exclusive=True):
+            try:
+                for fields in posts:
+                    post, stored = self._upsert_post(now, **fields)
+                    recorded.append(_public_copy(post))
+                    stored_posts[stored["id"]] = stored
+            finally:
+                # 途中で失敗してもキャッシュに反映済みの分はログに残す
+                self._append_events(list(stored_posts.values()))
+        return recorded
+
+    def _upsert_post(
+        self,
+        now: datetime,
+        platform: str,
+        post_id: str,
+        content_type: str,
+        week: str,
+        url: Optional[str] = None,
+        published_at: Optional[datetime] = None,
+    ) -> tuple[dict, dict]:
+        """
+        投稿をキャッシュに追加または更新（イベントログには書かない）
+
+        Returns:
+            tuple[dict, dict]: 記録した投稿データと、キャッシュ上の投稿
+        """
+        posts = self._ensure_loaded()
+        pub_dt = published_at or now
 
         post = {
             "id": f"{platform}-{post_id}",
-            "platform": platform,
+            "platform": sys.intern(platform),
             "post_id": post_id,
-            "content_type": content_type,
-            "week": week,
+            "content_type": sys.intern(content_type),
+            "week": sys.intern(week),
             "url": url,
-            "published_at": (published_at or datetime.now(timezone.utc)).isoformat(),
+            "published_at": pub_dt.isoformat(),
+            # 期間フィルタ用のエポック秒（集計時に published_at をパースしない）
+            "published_ts": pub_dt.timestamp(),
             "metrics": {},
-            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "last_updated": now.isoformat(),
         }
 
         # 既存の同じ投稿を更新するか、新規追加
-        existing_idx = next(
-            (i for i, p in enumerate(data["posts"]) if p["id"] == post["id"]),
-            None,
-        )
-        if existing_idx is not None:
-            data["posts"][existing_idx].update(post)
+        existing = posts.get(post["id"])
+        if existing is not None:
+            existing.update(post)
         else:
-            data["posts"].append(post)
+            posts[post["id"]] = existing = post
 
-        self._save_data(data)
-        return post
+        return post, existing
 
     def update_metrics(
         self,
@@ -124,37 +389,94 @@ class AnalyticsTracker:
         Returns:
             dict: 更新後の投稿データ（見つからない場合はNone）
         """
-        data = self._load_data()
-        target_id = f"{platform}-{post_id}"
-
-        for post in data["posts"]:
-            if post["id"] == target_id:
-                metrics = post.get("metrics", {})
-
-                if impressions is not None:
-                    metrics["impressions"] = impressions
-                if engagements is not None:
-                    metrics["engagements"] = engagements
-                if clicks is not None:
-                    metrics["clicks"] = clicks
-                if likes is not None:
-                    metrics["likes"] = likes
-                if retweets is not None:
-                    metrics["retweets"] = retweets
-                if replies is not None:
-                    metrics["replies"] = replies
-
-                # その他のメトリクス
-                for key, value in kwargs.items():
-                    metrics[key] = value
-
-                post["metrics"] = metrics
-                post["last_updated"] = datetime.now(timezone.utc).isoformat()
+        # 他のインスタンスの追記に追従してから更新し、続けて追記する
+        with self._locked(exclusive=True):
+            post = self._apply_metrics(
+                datetime.now(timezone.utc).isoformat(),
+                platform,
+                post_id,
+                impressions=impressions,
+                engagements=engagements,
+                clicks=clicks,
+                likes=likes,
+                retweets=retweets,
+                replies=replies,
+                **kwargs,
+            )
+            if post is not None:
+                self._append_events([post])
+        return _public_copy(post) if post is not None else None
+
+    def update_metrics_batch(self, updates: Iterable[dict]) -> list[Optional[dict]]:
+        """
+        複数の投稿のメトリクスをまとめて更新（イベントログへの書き込みは 1 回）
 
-                self._save_data(data)
-                return post
+        Args:
+            updates: update_metrics の引数（platform, post_id と各メトリクス）を
+                持つ dict の列
 
-        return None
+        Returns:
+            list[Optional[dict]]: 更新後の投稿データ（入力順、見つからない場合はNone）
+        """
+        now_iso = datetime.now(timezone.utc).isoformat()
+        results = []
+        # 同じ投稿への複数回の更新はログ 1 行にまとめる
+        updated = {}
+        # 他のインスタンスの追記に追従してから更新し、続けて追記する
+        with self._locked(exclusive=True):
+            try:
+                for fields in updates:
+                    post = self._apply_metrics(now_iso, **fields)
+                    if post is not None:
+                        updated[post["id"]] = post
+                        post = _public_copy(post)
+                    results.append(post)
+            finally:
+                # 途中で失敗してもキャッシュに反映済みの分はログに残す
+                self._append_events(list(updated.values()))
+        return results
+
+    def _apply_metrics(
+        self,
+        now_iso: str,
+        platform: str,
+        post_id: str,
+        impressions: Optional[int] = None,
+        engagements: Optional[int] = None,
+        clicks: Optional[int] = None,
+        likes: Optional[int] = None,
+        retweets: Optional[int] = None,
+        replies: Optional[int] = None,
+        **kwargs,
+    ) -> Optional[dict]:
+        """キャッシュ上の投稿のメトリクスを更新（イベントログには書かない）"""
+        target_id = f"{platform}-{post_id}"
+        post = self._ensure_loaded().get(target_id)
+        if post is None:
+            return None
+
+        metrics = post.get("metrics", {})
+
+        if impressions is not None:
+            metrics["impressions"] = impressions
+        if engagements is not None:
+            metrics["engagements"] = engagements
+        if clicks is not None:
+            metrics["clicks"] = clicks
+        if likes is not None:
+            metrics["likes"] = likes
+        if retweets is not None:
+            metrics["retweets"] = retweets
+        if replies is not None:
+            metrics["replies"] = replies
+
+        # その他のメトリクス
+        for key, value in kwargs.items():
+            metrics[key] = value
+
+        post["metrics"] = metrics
+        post["last_updated"] = now_iso
+        return post
 
     def get_performance_summary(
         self,
@@ -171,24 +493,23 @@ class AnalyticsTracker:
         Returns:
             dict: サマリデータ
         """
-        data = self._load_data()
-        posts = data.get("posts", [])
+        with self._locked(exclusive=False):
+            posts = list(self._ensure_loaded().values())
 
         if platform:
+            platform = sys.intern(platform)
             posts = [p for p in posts if p["platform"] == platform]
 
         # 最新 N 週分のみ
         from datetime import timedelta
 
-        cutoff = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+        cutoff_ts = (datetime.now(timezone.utc) - timedelta(weeks=weeks)).timestamp()
         recent_posts = []
         for post in posts:
-            try:
-                pub_date = datetime.fromisoformat(post["published_at"])
-                if pub_date >= cutoff:
-                    recent_posts.append(post)
-            except (ValueError, KeyError):
-                continue
+            # 旧データの published_ts はキャッシュに載せるときに補完済み
+            published_ts = post.get("published_ts")
+            if published_ts is not None and published_ts >= cutoff_ts:
+                recent_posts.append(post)
 
         # 集計
         total_impressions = 0
@@ -196,7 +517,7 @@ class AnalyticsTracker:
         total_clicks = 0
 
         for post in recent_posts:
-            metrics = post.get("metrics", {})
+            metrics = post.get("metrics") or _EMPTY_METRICS
             total_impressions += metrics.get("impressions", 0)
             total_engagements += metrics.get("engagements", 0)
             total_clicks += metrics.get("clicks", 0)
@@ -219,11 +540,14 @@ class AnalyticsTracker:
             "total_clicks": total_clicks,
             "engagement_rate": round(engagement_rate, 2),
             "click_rate": round(click_rate, 2),
-            "top_posts": sorted(
-                recent_posts,
-                key=lambda p: p.get("metrics", {}).get("engagements", 0),
-                reverse=True,
-            )[:5],
+            "top_posts": [
+                _public_copy(post)
+                for post in heapq.nlargest(
+                    5,
+                    recent_posts,
+                    key=lambda p: (p.get("metrics") or _EMPTY_METRICS).get("engagements", 0),
+                )
+            ],
         }
 
     def get_content_type_performance(self) -> dict:
@@ -233,33 +557,24 @@ class AnalyticsTracker:
         Returns:
             dict: タイプ別サマリ
         """
-        data = self._load_data()
-        posts = data.get("posts", [])
-
-        type_stats = {}
+        # タイプ別に [件数, インプレッション合計, エンゲージメント合計] を 1 パスで集計
+        totals: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+        with self._locked(exclusive=False):
+            posts = list(self._ensure_loaded().values())
         for post in posts:
-            content_type = post.get("content_type", "unknown")
-            if content_type not in type_stats:
-                type_stats[content_type] = {
-                    "count": 0,
-                    "total_impressions": 0,
-                    "total_engagements": 0,
-                }
-
-            stats = type_stats[content_type]
-            stats["count"] += 1
-            metrics = post.get("metrics", {})
-            stats["total_impressions"] += metrics.get("impressions", 0)
-            stats["total_engagements"] += metrics.get("engagements", 0)
-
-        # 平均を計算
-        for content_type, stats in type_stats.items():
-            if stats["count"] > 0:
-                stats["avg_impressions"] = round(
-                    stats["total_impressions"] / stats["count"]
-                )
-                stats["avg_engagements"] = round(
-                    stats["total_engagements"] / stats["count"]
-                )
+            acc = totals[post.get("content_type", "unknown")]
+            metrics = post.get("metrics") or _EMPTY_METRICS
+            acc[0] += 1
+            acc[1] += metrics.get("impressions", 0)
+            acc[2] += metrics.get("engagements", 0)
 
-        return type_stats
+        return {
+            content_type: {
+                "count": count,
+                "total_impressions": impressions,
+                "total_engagements": engagements,
+                "avg_impressions": round(impressions / count),
+                "avg_engagements": round(engagements / count),
+            }
+            for content_type, (count, impressions, engagements) in totals.items()
+        }
@@ -4,10 +4,45 @@ SNS投稿候補生成モジュール
 トレンド・アラートからSNS投稿候補を自動生成
 """
 
-import json
+import os
+import string
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+import orjson
+
+# 候補の優先度 → ソート順（未知の優先度は low 扱い）
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+def _priority_key(candidate: dict) -> int:
+    """候補の優先度ソートキー"""
+    return _PRIORITY_ORDER.get(candidate.get("priority", "low"), 2)
+
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    テンプレートを 1 回だけ解析し、str.format と同じ結果を返す関数に変換
+
+    書式指定・変換指定・属性参照を含むテンプレートは str.format をそのまま返す。
+    """
+    parsed = list(string.Formatter().parse(template))
+    if any(
+        field is not None and (spec or conversion or not field.isidentifier())
+        for _, field, spec, conversion in parsed
+    ):
+        return template.format
+
+    pieces = [(literal, field) for literal, field, _, _ in parsed]
+
+    def render(**fields) -> str:
+        return "".join(
+            literal if field is None else literal + format(fields[field])
+            for literal, field in pieces
+        )
+
+    return render
 
 
 class ContentGenerator:
@@ -60,6 +95,9 @@ class ContentGenerator:
 #AI #速報""",
     }
 
+    # 解析済みテンプレート（生成のたびにテンプレートを解析しない）
+    _COMPILED_TEMPLATES = {name: _compile_template(tpl) for name, tpl in TEMPLATES.items()}
+
     def __init__(self, output_dir: Path):
         """
         Args:
@@ -84,17 +122,21 @@ class ContentGenerator:
             return text
         return text[: limit - 3] + "..."
 
-    def generate_from_trends(self, trends: dict) -> list[dict]:
+    def generate_from_trends(
+        self, trends: dict, now: Optional[datetime] = None
+    ) -> list[dict]:
         """
         トレンドデータから投稿候補を生成
 
         Args:
             trends: TrendDetector の出力
+            now: 生成日時（省略時は現在時刻）
 
         Returns:
             list[dict]: 投稿候補リスト
         """
         candidates = []
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
         rising = trends.get("trends", {}).get("rising", [])
 
         for trend in rising[:3]:  # 上位3件
@@ -103,13 +145,13 @@ class ContentGenerator:
             change = trend.get("change", "")
 
             if change == "new":
-                template = self.TEMPLATES["trend_new"]
+                template = self._COMPILED_TEMPLATES["trend_new"]
                 context = f"今週 {trend.get('current_count', 0)} 回出現"
             else:
-                template = self.TEMPLATES["trend_rising"]
+                template = self._COMPILED_TEMPLATES["trend_rising"]
                 context = f"{trend.get('prev_count', 0)} → {trend.get('current_count', 0)}"
 
-            content = template.format(
+            content = template(
                 keyword=keyword,
                 ratio=ratio if ratio != float("inf") else "∞",
                 context=context,
@@ -126,7 +168,7 @@ class ContentGenerator:
                     "full_content": content,
                     "source_data": trend,
                     "priority": "high" if change == "new" else "medium",
-                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "generated_at": now_iso,
                 }
             )
 
@@ -137,6 +179,7 @@ class ContentGenerator:
         week: str,
         digest: dict,
         alerts: Optional[list] = None,
+        now: Optional[datetime] = None,
     ) -> list[dict]:
         """
         週次ダイジェストから投稿候補を生成
@@ -145,11 +188,13 @@ class ContentGenerator:
             week: 週番号（YYYY-WXX）
             digest: digest JSON
             alerts: アラートリスト
+            now: 生成日時（省略時は現在時刻）
 
         Returns:
             list[dict]: 投稿候補リスト
         """
         candidates = []
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
         summary = digest.get("summary", {})
 
         # メインダイジェスト投稿
@@ -166,7 +211,7 @@ class ContentGenerator:
         if highlights:
             highlights_text = "\n".join([f"• {h[:30]}..." for h in highlights[:2]])
 
-        content = self.TEMPLATES["weekly_digest"].format(
+        content = self._COMPILED_TEMPLATES["weekly_digest"](
             week=week,
             summary=summary_text,
             highlights=highlights_text,
@@ -182,7 +227,7 @@ class ContentGenerator:
                 "full_content": content,
                 "source_data": {"week": week, "summary": summary},
                 "priority": "high",
-                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "generated_at": now_iso,
             }
         )
 
@@ -192,7 +237,7 @@ class ContentGenerator:
                 a for a in alerts if a.get("type") in ("security", "breaking")
             ]
             for alert in critical_alerts[:2]:
-                alert_content = self.TEMPLATES["alert"].format(
+                alert_content = self._COMPILED_TEMPLATES["alert"](
                     alert_type="重要アップデート",
                     title=alert.get("title", "")[:50],
                     description=alert.get("description", "")[:100],
@@ -206,29 +251,33 @@ class ContentGenerator:
                         "full_content": alert_content,
                         "source_data": alert,
                         "priority": "high",
-                        "generated_at": datetime.now(timezone.utc).isoformat(),
+                        "generated_at": now_iso,
                     }
                 )
 
         return candidates
 
-    def generate_from_opportunities(self, entries: list[dict]) -> list[dict]:
+    def generate_from_opportunities(
+        self, entries: list[dict], now: Optional[datetime] = None
+    ) -> list[dict]:
         """
         ビジネス機会エントリから投稿候補を生成
 
         Args:
             entries: 競合分析のopportunities結果
+            now: 生成日時（省略時は現在時刻）
 
         Returns:
             list[dict]: 投稿候補リスト
         """
         candidates = []
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
 
         for entry in entries[:3]:
             title = entry.get("title", "")[:50]
             summary = entry.get("summary", "")[:100]
 
-            content = self.TEMPLATES["opportunity"].format(
+            content = self._COMPILED_TEMPLATES["opportunity"](
                 title=title,
                 insight=summary,
             )
@@ -241,19 +290,22 @@ class ContentGenerator:
                     "full_content": content,
                     "source_data": entry,
                     "priority": "low",
-                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "generated_at": now_iso,
                 }
             )
 
         return candidates
 
-    def save_candidates(self, candidates: list[dict], week: str) -> Path:
+    def save_candidates(
+        self, candidates: list[dict], week: str, now: Optional[datetime] = None
+    ) -> Path:
         """
         投稿候補を保存
 
         Args:
             candidates: 投稿候補リスト
             week: 週番号
+            now: 保存日時（省略時は現在時刻）
 
         Returns:
             Path: 保存先パス
@@ -262,14 +314,16 @@ class ContentGenerator:
         output_path = self.output_dir / filename
 
         data = {
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": (now or datetime.now(timezone.utc)).isoformat(),
             "week": week,
             "candidates_count": len(candidates),
             "candidates": candidates,
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # tmp に書いてから原子的に置換
+        tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, output_path)
 
         return output_path
 
@@ -289,13 +343,11 @@ class ContentGenerator:
         if not file_path.exists():
             return []
 
-        with open(file_path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(file_path.read_bytes())
 
         candidates = data.get("candidates", [])
 
         # 優先度でソート
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        candidates.sort(key=lambda c: priority_order.get(c.get("priority", "low"), 2))
+        candidates.sort(key=_priority_key)
 
         return candidates
@@ -12,12 +12,19 @@ exports/digest-*.json → docs/weekly/public-*.md
 """
 
 import argparse
-import json
+import os
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator, Optional
 
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml なしでビルドされた PyYAML
+    from yaml import SafeLoader
+
 # パス設定
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -27,11 +34,24 @@ OUTPUT_DIR = PROJECT_ROOT / "docs" / "weekly"
 
 def get_latest_week() -> str | None:
     """最新の digest ファイルから週番号を取得"""
-    digests = sorted(EXPORTS_DIR.glob("digest-*.json"), reverse=True)
-    if not digests:
+    # Path を作らず名前だけを 1 パスで比較して最大のものを選ぶ
+    latest = None
+    try:
+        with os.scandir(EXPORTS_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name.startswith("digest-")
+                    and name.endswith(".json")
+                    and (latest is None or name > latest)
+                ):
+                    latest = name
+    except FileNotFoundError:
+        return None
+    if latest is None:
         return None
     # digest-2025-W51.json → 2025-W51
-    return digests[0].stem.replace("digest-", "")
+    return latest[len("digest-") : -len(".json")]
 
 
 def load_digest(week: str) -> dict:
@@ -39,23 +59,33 @@ def load_digest(week: str) -> dict:
     path = EXPORTS_DIR / f"digest-{week}.json"
     if not path.exists():
         return {}
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(path.read_bytes())
+
+
+# 「注目リリース」として扱うアラートタイプ
+IMPORTANT_ALERT_TYPES = frozenset(("security", "breaking"))
+# 公開ダイジェストに載せるアラートの上限
+MAX_IMPORTANT_ALERTS = 3
+MAX_NOTICE_ALERTS = 5
 
 
-def load_alerts(week: str) -> list[dict]:
-    """alerts YAML を読み込み（重複排除済み）"""
+def load_alerts(week: str) -> dict[str, list[dict]]:
+    """alerts YAML を読み込み（重複排除済み）
+
+    Returns:
+        unique（全件）/ important（注目リリース）/ notice（その他の更新）に
+        振り分けたアラート。important / notice は掲載上限までに切り詰める
+    """
+    alerts: dict[str, list[dict]] = {"unique": [], "important": [], "notice": []}
     path = EXPORTS_DIR / f"alerts-{week}.yaml"
     if not path.exists():
-        return []
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-        raw_alerts = data.get("alerts", []) if data else []
+        return alerts
+    data = yaml.load(path.read_bytes(), Loader=SafeLoader)
+    raw_alerts = data.get("alerts", []) if data else []
 
-    # URL とタイトルで重複排除
+    # URL とタイトルで重複排除し、同じパスでタイプ別に振り分け
     seen_urls: set[str] = set()
     seen_titles: set[str] = set()
-    unique_alerts = []
     for alert in raw_alerts:
         url = alert.get("url", "")
         title = alert.get("title", "")
@@ -70,9 +100,17 @@ def load_alerts(week: str) -> list[dict]:
             seen_urls.add(url)
         if title:
             seen_titles.add(title)
-        unique_alerts.append(alert)
+        alerts["unique"].append(alert)
+
+        alert_type = alert.get("type")
+        if alert_type in IMPORTANT_ALERT_TYPES:
+            if len(alerts["important"]) < MAX_IMPORTANT_ALERTS:
+                alerts["important"].append(alert)
+        elif alert_type == "notice":
+            if len(alerts["notice"]) < MAX_NOTICE_ALERTS:
+                alerts["notice"].append(alert)
 
-    return unique_alerts
+    return alerts
 
 
 def load_adopted(week: str) -> list[dict]:
@@ -80,97 +118,110 @@ def load_adopted(week: str) -> list[dict]:
     path = EXPORTS_DIR / f"adopted-{week}.yaml"
     if not path.exists():
         return []
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-        return data.get("adopted", []) if data else []
-
-
-def format_blog_digest(week: str, digest: dict, alerts: list, adopted: list) -> str:
-    """ブログ/Note 向けフルバージョン"""
+    data = yaml.load(path.read_bytes(), Loader=SafeLoader)
+    return data.get("adopted", []) if data else []
+
+
+def _iter_blog_lines(
+    week: str,
+    digest: dict,
+    alerts: dict,
+    adopted: list,
+    now: Optional[datetime] = None,
+) -> Iterator[str]:
+    """ブログ/Note 向けフルバージョンを 1 行ずつ生成"""
     summary = digest.get("summary", {})
     total = summary.get("total_evaluated", 0)
     layer3 = summary.get("layer_3_count", 0)
     layer2 = summary.get("layer_2_count", 0)
 
-    lines = [
-        f"# 🛰 AI Update Radar - {week}",
-        "",
-        f"> 今週の AI 界隈の動向サマリ（{total}件を評価）",
-        "",
-        "---",
-        "",
-        "## 📊 今週の数字",
-        "",
-        f"- **評価した更新**: {total}件",
-        f"- **要注目（Layer3）**: {layer3}件",
-        f"- **記録のみ（Layer2）**: {layer2}件",
-        "",
-    ]
+    yield f"# 🛰 AI Update Radar - {week}"
+    yield ""
+    yield f"> 今週の AI 界隈の動向サマリ（{total}件を評価）"
+    yield ""
+    yield "---"
+    yield ""
+    yield "## 📊 今週の数字"
+    yield ""
+    yield f"- **評価した更新**: {total}件"
+    yield f"- **要注目（Layer3）**: {layer3}件"
+    yield f"- **記録のみ（Layer2）**: {layer2}件"
+    yield ""
 
     # リリース/更新情報（security/breaking → 「リリース」として扱う）
-    important_alerts = [a for a in alerts if a.get("type") in ("security", "breaking")]
-    notice_alerts = [a for a in alerts if a.get("type") == "notice"]
+    important_alerts = alerts["important"]
+    notice_alerts = alerts["notice"]
 
     if important_alerts:
-        lines.append("## 📢 注目リリース")
-        lines.append("")
-        for alert in important_alerts[:3]:  # 最大3件
+        yield "## 📢 注目リリース"
+        yield ""
+        for alert in important_alerts:
             title = alert.get("title", "")
             url = alert.get("url", "")
-            lines.append(f"- **{title}**")
+            yield f"- **{title}**"
             if url:
-                lines.append(f"  - {url}")
-        lines.append("")
+                yield f"  - {url}"
+        yield ""
 
     if notice_alerts:
-        lines.append("## 📝 その他の更新")
-        lines.append("")
-        for alert in notice_alerts[:5]:  # 最大5件
+        yield "## 📝 その他の更新"
+        yield ""
+        for alert in notice_alerts:
             title = alert.get("title", "")
-            lines.append(f"- {title}")
-        lines.append("")
+            yield f"- {title}"
+        yield ""
 
     # 採用候補
     if adopted:
-        lines.append("## ✅ 採用候補")
-        lines.append("")
+        yield "## ✅ 採用候補"
+        yield ""
         for item in adopted[:3]:
             name = item.get("name", "unknown")
-            lines.append(f"- {name}")
-        lines.append("")
+            yield f"- {name}"
+        yield ""
 
     # PoC
     highlights = digest.get("highlights", [])
     if highlights:
-        lines.append("## 🧪 PoC 進行中")
-        lines.append("")
+        yield "## 🧪 PoC 進行中"
+        yield ""
         for h in highlights[:3]:
-            lines.append(f"- {h}")
-        lines.append("")
+            yield f"- {h}"
+        yield ""
 
     # フッター
-    lines.append("---")
-    lines.append("")
+    yield "---"
+    yield ""
 
     # 導線（収益化の入口）
-    lines.append("## 📬 AI運用についてのご相談")
-    lines.append("")
-    lines.append("AI更新を追うのではなく、**採用判断まで含めた運用設計**をサポートします。")
-    lines.append("")
-    lines.append("- 週次ダイジェスト生成の仕組み構築")
-    lines.append("- 採用ルール・評価基準の策定")
-    lines.append("- PoC テンプレート・実験環境の設計")
-    lines.append("")
-    lines.append("ご相談は **X（@Tech_Fumi1）の DM** へ")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"*Generated by AI Update Radar - {datetime.now().strftime('%Y-%m-%d')}*")
-
-    return "\n".join(lines)
-
-
-def format_x_digest(week: str, digest: dict, alerts: list, adopted: list) -> str:
+    yield "## 📬 AI運用についてのご相談"
+    yield ""
+    yield "AI更新を追うのではなく、**採用判断まで含めた運用設計**をサポートします。"
+    yield ""
+    yield "- 週次ダイジェスト生成の仕組み構築"
+    yield "- 採用ルール・評価基準の策定"
+    yield "- PoC テンプレート・実験環境の設計"
+    yield ""
+    yield "ご相談は **X（@Tech_Fumi1）の DM** へ"
+    yield ""
+    yield "---"
+    yield ""
+    generated_on = (now or datetime.now()).strftime("%Y-%m-%d")
+    yield f"*Generated by AI Update Radar - {generated_on}*"
+
+
+def format_blog_digest(
+    week: str,
+    digest: dict,
+    alerts: dict,
+    adopted: list,
+    now: Optional[datetime] = None,
+) -> str:
+    """ブログ/Note 向けフルバージョン（now はフッターの生成日、省略時は現在時刻）"""
+    return "\n".join(_iter_blog_lines(week, digest, alerts, adopted, now))
+
+
+def format_x_digest(week: str, digest: dict, alerts: dict, adopted: list) -> str:
     """
     X (Twitter) 向け短縮版（280字以内目標）
 
@@ -187,7 +238,7 @@ def format_x_digest(week: str, digest: dict, alerts: list, adopted: list) -> str
     highlights = digest.get("highlights", [])
 
     # 注目リリースを1つ取得（security → 「リリース」として扱う）
-    important_alerts = [a for a in alerts if a.get("type") in ("security", "breaking")]
+    important_alerts = alerts["important"]
     top_release = important_alerts[0]["title"] if important_alerts else None
 
     parts = []
@@ -221,15 +272,31 @@ def format_x_digest(week: str, digest: dict, alerts: list, adopted: list) -> str
     return "\n".join(parts)
 
 
-def format_note_digest(week: str, digest: dict, alerts: list, adopted: list) -> str:
-    """Note 向け（ブログと同じだが見出しを少し調整）"""
+def format_note_digest(
+    week: str,
+    digest: dict,
+    alerts: dict,
+    adopted: list,
+    now: Optional[datetime] = None,
+    blog_content: Optional[str] = None,
+) -> str:
+    """Note 向け（ブログと同じだが見出しを少し調整）
+
+    blog_content に生成済みのブログ版を渡すと、それを元にして再生成しない。
+    """
     # 基本はブログと同じ
-    content = format_blog_digest(week, digest, alerts, adopted)
+    content = blog_content
+    if content is None:
+        content = format_blog_digest(week, digest, alerts, adopted, now)
     # Note 向けの調整（絵文字多め、読みやすい改行）
     return content
 
 
-def main():
+def main(argv: Optional[list[str]] = None):
+    """
+    Args:
+        argv: コマンドライン引数（None なら sys.argv を使う）
+    """
     parser = argparse.ArgumentParser(description="公開用ダイジェスト生成")
     parser.add_argument("--week", help="対象週（例: 2025-W51）")
     parser.add_argument(
@@ -239,7 +306,7 @@ def main():
         help="出力形式（default: all）",
     )
     parser.add_argument("--dry-run", action="store_true", help="ファイル出力せず表示のみ")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # 週の決定
     week = args.week or get_latest_week()
@@ -259,21 +326,28 @@ def main():
         return 1
 
     print(f"  ✅ digest: {len(digest)} keys")
-    print(f"  ✅ alerts: {len(alerts)} 件")
+    print(f"  ✅ alerts: {len(alerts['unique'])} 件")
     print(f"  ✅ adopted: {len(adopted)} 件")
     print()
 
     # 出力ディレクトリ作成
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    # 全フォーマットで同じ生成日を使う
+    run_at = datetime.now()
+    # ブログ版は Note 版の元にもなるので 1 回だけ生成する
+    blog_content: Optional[str] = None
+
     formats_to_generate = ["blog", "note", "x"] if args.format == "all" else [args.format]
 
     for fmt in formats_to_generate:
         if fmt == "blog":
-            content = format_blog_digest(week, digest, alerts, adopted)
+            content = blog_content = format_blog_digest(week, digest, alerts, adopted, run_at)
             filename = f"public-{week}-blog.md"
         elif fmt == "note":
-            content = format_note_digest(week, digest, alerts, adopted)
+            content = format_note_digest(
+                week, digest, alerts, adopted, run_at, blog_content=blog_content
+            )
             filename = f"public-{week}-note.md"
         elif fmt == "x":
             content = format_x_digest(week, digest, alerts, adopted)
@@ -12,19 +12,32 @@ AI Update Radar - 週次自動公開スクリプト
     python3 scripts/weekly-auto-publish.py
     python3 scripts/weekly-auto-publish.py --dry-run
     python3 scripts/weekly-auto-publish.py --force-review
+    python3 scripts/weekly-auto-publish.py --weeks 2025-W50,2025-W51
 """
 
 import argparse
-import json
+import contextlib
+import functools
+import importlib.util
+import io
 import os
-import subprocess
+import re
+import shutil
 import sys
-from datetime import datetime
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 
-import requests
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml なしでビルドされた PyYAML
+    from yaml import SafeLoader
+
 # パス設定
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -32,20 +45,22 @@ EXPORTS_DIR = PROJECT_ROOT / "exports"
 OUTPUT_DIR = PROJECT_ROOT / "docs" / "weekly"
 DRAFTS_DIR = PROJECT_ROOT / "drafts"
 
+# 人間レビューが必要なアラートタイプ
+CRITICAL_ALERT_TYPES = frozenset(("security", "breaking"))
+
+
+# .env の 1 行（KEY=VALUE）。空行・# コメント・キーか値が空の行にはマッチしない
+_ENV_LINE_RE = re.compile(
+    r"^[^\S\n]*([^#\s=][^=\n]*?)[^\S\n]*=[^\S\n]*(\S[^\n]*?)[^\S\n]*$", re.M
+)
+
 
 def load_env():
     """プロジェクトルートの .env を読み込み"""
     env_path = PROJECT_ROOT / ".env"
     if env_path.exists():
-        with open(env_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, _, value = line.partition("=")
-                    key = key.strip()
-                    value = value.strip()
-                    if key and value:
-                        os.environ.setdefault(key, value)
+        for key, value in _ENV_LINE_RE.findall(env_path.read_text(encoding="utf-8")):
+            os.environ.setdefault(key, value)
 
 
 # .env 読み込み（cron 実行時にも対応）
@@ -55,6 +70,20 @@ load_env()
 DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_ALERT_WEBHOOK_URL", "")
 
 
+@functools.cache
+def _get_session():
+    """Discord 通知用の Session（通知ごとに接続・TLS ハンドシェイクをやり直さないよう使い回す）
+
+    requests の import は重いので、実際に通知するときまで遅らせる
+    （dry-run や Webhook 未設定の実行では読み込まない）。
+    """
+    import requests
+
+    session = requests.Session()
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
 def get_current_week() -> str:
     """現在の週番号を取得（ISO形式）"""
     now = datetime.now()
@@ -63,29 +92,44 @@ def get_current_week() -> str:
 
 def get_latest_week() -> str | None:
     """最新の digest ファイルから週番号を取得"""
-    digests = sorted(EXPORTS_DIR.glob("digest-*.json"), reverse=True)
-    if not digests:
+    # Path を作らず名前だけを 1 パスで比較して最大のものを選ぶ
+    latest = None
+    try:
+        with os.scandir(EXPORTS_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name.startswith("digest-")
+                    and name.endswith(".json")
+                    and (latest is None or name > latest)
+                ):
+                    latest = name
+    except FileNotFoundError:
         return None
-    return digests[0].stem.replace("digest-", "")
+    if latest is None:
+        return None
+    # digest-2025-W51.json → 2025-W51
+    return latest[len("digest-") : -len(".json")]
 
 
 def load_digest(week: str) -> dict:
     """digest JSON を読み込み"""
     path = EXPORTS_DIR / f"digest-{week}.json"
-    if not path.exists():
+    # 存在確認の stat を省き、1 回の open + read でまとめて読み込み
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
         return {}
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
 
 
 def load_alerts(week: str) -> list[dict]:
     """alerts YAML を読み込み（重複排除済み）"""
     path = EXPORTS_DIR / f"alerts-{week}.yaml"
-    if not path.exists():
+    try:
+        data = yaml.load(path.read_bytes(), Loader=SafeLoader)
+    except FileNotFoundError:
         return []
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-        raw_alerts = data.get("alerts", []) if data else []
+    raw_alerts = data.get("alerts", []) if data else []
 
     # URL とタイトルで重複排除
     seen_urls: set[str] = set()
@@ -107,26 +151,34 @@ def load_alerts(week: str) -> list[dict]:
     return unique_alerts
 
 
-def check_needs_review(digest: dict, alerts: list) -> tuple[bool, list[str]]:
+def check_needs_review(layer3_count: int, alerts: list) -> tuple[bool, list[str]]:
     """
     人間レビューが必要かどうかを判定
 
+    Args:
+        layer3_count: digest summary の layer_3_count
+        alerts: 重複排除済みのアラート
+
     Returns:
         (needs_review: bool, reasons: list[str])
     """
     reasons = []
 
-    summary = digest.get("summary", {})
-    layer3_count = summary.get("layer_3_count", 0)
-
     # Layer3 が 1 件以上 → 要確認
     if layer3_count > 0:
         reasons.append(f"Layer3（要深掘り）が {layer3_count} 件あります")
 
     # security/breaking アラートがある → 要確認
-    critical_alerts = [a for a in alerts if a.get("type") in ("security", "breaking")]
-    if critical_alerts:
-        titles = [a.get("title", "不明")[:30] for a in critical_alerts[:3]]
+    # 先頭 3 件が揃った時点で走査を打ち切る
+    titles = list(islice(
+        (
+            a.get("title", "不明")[:30]
+            for a in alerts
+            if a.get("type") in CRITICAL_ALERT_TYPES
+        ),
+        3,
+    ))
+    if titles:
         reasons.append(f"重要アラート: {', '.join(titles)}")
 
     return len(reasons) > 0, reasons
@@ -145,12 +197,16 @@ def send_discord_notification(message: str, urgent: bool = False):
             "title": "🛰 AI Update Radar",
             "description": message,
             "color": color,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc),
         }]
     }
 
     try:
-        resp = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
+        # orjson でシリアライズしたバイト列をそのまま送る（datetime も直接扱える）
+        body = orjson.dumps(
+            payload, option=orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS
+        )
+        resp = _get_session().post(DISCORD_WEBHOOK_URL, data=body, timeout=10)
         resp.raise_for_status()
         return True
     except Exception as e:
@@ -169,50 +225,97 @@ def save_as_draft(week: str):
         dst = DRAFTS_DIR / f"draft-{week}-{fmt}.{ext}"
 
         if src.exists():
-            dst.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+            # バイト列のままコピー（Linux では sendfile でカーネル内コピーになる）
+            shutil.copyfile(src, dst)
 
     print(f"📝 下書き保存: {DRAFTS_DIR}/")
 
 
+@functools.cache
+def _load_generate_public_digest():
+    """generate-public-digest.py をモジュールとして読み込み（ファイル名にハイフンがあるため）
+
+    複数週を処理するときも読み込みは 1 回だけ。
+    """
+    spec = importlib.util.spec_from_file_location(
+        "generate_public_digest", SCRIPT_DIR / "generate-public-digest.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def run_generate_digest(week: str) -> bool:
-    """公開用ダイジェストを生成"""
-    cmd = [
-        sys.executable,
-        str(SCRIPT_DIR / "generate-public-digest.py"),
-        "--week", week
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        print(f"❌ generate-public-digest 失敗:\n{result.stderr}")
+    """公開用ダイジェストを生成（子プロセスを起動せず同じプロセスで実行）"""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            returncode = _load_generate_public_digest().main(["--week", week])
+    except SystemExit as e:  # argparse のエラー等
+        returncode = e.code
+    except Exception:
+        returncode = 1
+        output.write(traceback.format_exc())
+
+    if returncode:
+        print(f"❌ generate-public-digest 失敗:\n{output.getvalue()}")
         return False
 
-    print(result.stdout)
+    print(output.getvalue())
     return True
 
 
 def get_x_content(week: str) -> str:
     """X投稿用コンテンツを取得"""
     path = OUTPUT_DIR / f"public-{week}-x.txt"
-    if not path.exists():
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         return ""
-    return path.read_text(encoding="utf-8")
 
 
 def main():
     parser = argparse.ArgumentParser(description="週次自動公開")
     parser.add_argument("--week", help="対象週（例: 2025-W51）")
+    parser.add_argument(
+        "--weeks",
+        help="複数週をまとめて処理（カンマ区切り、例: 2025-W50,2025-W51）",
+    )
     parser.add_argument("--dry-run", action="store_true", help="実行せずに確認のみ")
     parser.add_argument("--force-review", action="store_true", help="強制的にレビューモード")
     parser.add_argument("--skip-generate", action="store_true", help="生成をスキップ")
     args = parser.parse_args()
 
     # 週の決定
-    week = args.week or get_latest_week()
-    if not week:
+    if args.weeks:
+        weeks = [w.strip() for w in args.weeks.split(",") if w.strip()]
+    else:
+        week = args.week or get_latest_week()
+        weeks = [week] if week else []
+    if not weeks:
         print("❌ 対象週が見つかりません")
         return 1
 
+    # 複数週は同じプロセスで順に処理（起動・import・.env 読み込みは 1 回で済む）
+    failed = [week for week in weeks if publish_week(week, args) != 0]
+    if len(weeks) > 1:
+        print(f"📦 {len(weeks) - len(failed)}/{len(weeks)} 週を処理しました")
+        if failed:
+            print(f"❌ 失敗: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def publish_week(week: str, args: argparse.Namespace) -> int:
+    """
+    1 週分の公開処理（生成 → 判定 → 下書き保存 / 通知）
+
+    Args:
+        week: 対象週（YYYY-WXX）
+        args: コマンドライン引数（dry_run / force_review / skip_generate）
+
+    Returns:
+        int: 終了コード（0=成功）
+    """
     print(f"{'=' * 50}")
     print(f"🛰 AI Update Radar 週次自動公開")
     print(f"📅 対象週: {week}")
@@ -226,27 +329,31 @@ def main():
             return 1
         print()
 
-    # 2. データ読み込み
-    digest = load_digest(week)
-    alerts = load_alerts(week)
+    # 2. データ読み込み（互いに独立した読み込みを並列に実行）
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        digest_future = executor.submit(load_digest, week)
+        alerts_future = executor.submit(load_alerts, week)
+        x_content_future = executor.submit(get_x_content, week)
+        digest = digest_future.result()
+        alerts = alerts_future.result()
+        x_content = x_content_future.result()
 
     if not digest:
         print(f"❌ digest-{week}.json が見つかりません")
         return 1
 
+    summary = digest.get("summary", {})
+    total = summary.get("total_evaluated", 0)
+    layer3 = summary.get("layer_3_count", 0)
+
     # 3. レビュー必要性の判定
-    needs_review, reasons = check_needs_review(digest, alerts)
+    needs_review, reasons = check_needs_review(layer3, alerts)
 
     if args.force_review:
         needs_review = True
         reasons.append("--force-review が指定されました")
 
     # 4. 結果に応じた処理
-    summary = digest.get("summary", {})
-    total = summary.get("total_evaluated", 0)
-    layer3 = summary.get("layer_3_count", 0)
-
-    x_content = get_x_content(week)
 
     if needs_review:
         # === 要確認モード ===
@@ -262,13 +369,14 @@ def main():
             save_as_draft(week)
 
             # Discord 通知
+            reason_lines = "\n".join("• " + r for r in reasons)
             message = f"""**週次レポート確認依頼**
 
 📅 **{week}**
 📊 評価: {total}件 / Layer3: {layer3}件
 
 ⚠️ **確認が必要な理由:**
-{chr(10).join('• ' + r for r in reasons)}
+{reason_lines}
 
 👉 `drafts/` フォルダを確認して、問題なければ手動投稿してください。"""
 
@@ -2,36 +2,6 @@
 
 
 
-class TestRSSCollector:
-    """RSS コレクターのテスト"""
-
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from collectors import RSSCollector
-
-        assert RSSCollector is not None
-
-
-class TestGitHubCollector:
-    """GitHub コレクターのテスト"""
-
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from collectors import GitHubCollector
-
-        assert GitHubCollector is not None
-
-
-class TestPageDiffCollector:
-    """PageDiff コレクターのテスト"""
-
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from collectors import PageDiffCollector
-
-        assert PageDiffCollector is not None
-
-
 class TestModels:
     """models モジュールのテスト"""
 
@@ -43,9 +13,3 @@ class TestModels:
         assert Category.CONSTRAINT is not None
         assert Category.PRICING is not None
         assert Category.OTHER is not None
-
-    def test_import_collected_entry(self):
-        """CollectedEntry がインポートできること"""
-        from collectors.models import CollectedEntry
-
-        assert CollectedEntry is not None
@@ -2,29 +2,6 @@
 
 
 
-class TestCategoryClassifier:
-    """カテゴリ分類器のテスト"""
-
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from evaluators import CategoryClassifier, ClassificationResult
-
-        assert CategoryClassifier is not None
-        assert ClassificationResult is not None
-
-
-class TestRelevanceScorer:
-    """関連性スコアラーのテスト"""
-
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from evaluators import EvaluationResult, RelevanceScorer, ScoringBreakdown
-
-        assert RelevanceScorer is not None
-        assert EvaluationResult is not None
-        assert ScoringBreakdown is not None
-
-
 class TestLayer:
     """Layer enum のテスト"""
 
@@ -40,19 +17,195 @@ class TestLayer:
 class TestEvaluationLogger:
     """EvaluationLogger のテスト"""
 
-    def test_import(self):
-        """モジュールがインポートできること"""
-        from evaluators import EvaluationLogger
+    def test_log_many_roundtrip(self, tmp_path):
+        """log_many で書いたログを get_recent_logs で読み戻せること"""
+        from collectors.models import CollectedEntry, SourceType
+        from evaluators import EvaluationLogger, RelevanceScorer
 
-        assert EvaluationLogger is not None
+        entries = [
+            CollectedEntry(
+                title=f"MCP update {i}",
+                url=f"https://example.com/{i}",
+                source_name="Test",
+                source_type=SourceType.RSS,
+            )
+            for i in range(3)
+        ]
+        results = RelevanceScorer().evaluate_batch(entries)
+        logger = EvaluationLogger(log_dir=tmp_path)
+
+        paths = logger.log_many(results)
+
+        assert len(paths) == 1
+        logs = logger.get_recent_logs(days=1)
+        assert sorted(log["entry"]["url"] for log in logs) == [e.url for e in entries]
+
+        # 同日に同じ結果を再記録しても重複しない（新しいインスタンスでも同様）
+        logger.log_many(results)
+        EvaluationLogger(log_dir=tmp_path).log_many(results)
+        assert len(logger.get_recent_logs(days=1)) == len(entries)
 
 
 class TestExporter:
     """Exporter のテスト"""
 
-    def test_import(self):
-        """モジュールがインポートできること"""
+    def test_empty_exports_match_yaml_dump(self, tmp_path):
+        """項目が空のときの YAML 出力が yaml.dump と同じ内容になること"""
+        import yaml
+
         from evaluators import ExportConfig, Exporter
 
-        assert Exporter is not None
-        assert ExportConfig is not None
+        exporter = Exporter(ExportConfig(exports_dir=tmp_path))
+
+        for path, key in [
+            (exporter.export_adopted_list([]), "adopted"),
+            (exporter.export_alerts([]), "alerts"),
+        ]:
+            text = path.read_text(encoding="utf-8")
+            data = yaml.safe_load(text)
+            assert data[key] == []
+            assert text == yaml.dump(
+                data, allow_unicode=True, default_flow_style=False, sort_keys=False
+            )
+
+
+class TestArticleEvaluator:
+    """ArticleEvaluator のテスト"""
+
+    @staticmethod
+    def _entries(n: int, prefilter_score: int = 2) -> list:
+        import json
+
+        from collectors.models import CollectedEntry, SourceType
+
+        return [
+            CollectedEntry(
+                title=f"記事 {i}",
+                url=f"https://example.com/{i}",
+                source_name="Test",
+                source_type=SourceType.RSS,
+                raw_content=json.dumps({"prefilter_score": prefilter_score}),
+            )
+            for i in range(n)
+        ]
+
+    def test_evaluate_batch_keeps_order(self):
+        """並列評価でも入力順に結果が並ぶこと"""
+        import json
+        import re
+
+        from evaluators.article_evaluator import ArticleEvaluator
+
+        def send_fn(question: str, **kwargs) -> str:
+            count = len(re.findall(r"^\[\d+\] ", question, flags=re.MULTILINE))
+            items = [
+                {"index": i + 1, "relevance": 3, "actionability": 3,
+                 "summary_ja": "", "recommended_action": "watch"}
+                for i in range(count)
+            ]
+            return json.dumps(items)
+
+        entries = self._entries(12)
+        evaluator = ArticleEvaluator(send_fn=send_fn, max_concurrency=4, batch_size=5)
+        result = evaluator.evaluate_batch(entries)
+
+        assert [e.url for e in result.evaluations] == [e.url for e in entries]
+        assert result.llm_evaluated == 12
+        assert result.fallback_used == 0
+
+    def test_evaluate_batch_fallback(self):
+        """LLM 失敗時はフォールバック評価になること"""
+        from evaluators.article_evaluator import ArticleEvaluator
+
+        def send_fn(**kwargs) -> str:
+            raise RuntimeError("unavailable")
+
+        evaluator = ArticleEvaluator(send_fn=send_fn, batch_size=3)
+        result = evaluator.evaluate_batch(self._entries(7))
+
+        assert len(result.evaluations) == 7
+        assert result.fallback_used == 7
+        assert all(e.evaluation_source == "fallback" for e in result.evaluations)
+
+    def test_zero_prefilter_score_skips_llm(self):
+        """prefilter スコア 0 の記事は LLM に送られないこと"""
+        from evaluators.article_evaluator import ArticleEvaluator
+
+        def send_fn(**kwargs) -> str:
+            raise AssertionError("LLM は呼ばれないはず")
+
+        evaluator = ArticleEvaluator(send_fn=send_fn)
+        result = evaluator.evaluate_batch(self._entries(4, prefilter_score=0))
+
+        assert result.llm_evaluated == 0
+        assert result.fallback_used == 4
+        assert all(e.recommended_action == "skip" for e in result.evaluations)
+
+    def test_extract_json(self):
+        """前置きテキストや角括弧を含むレスポンスから JSON 配列を抽出できること"""
+        from evaluators.article_evaluator import ArticleEvaluator
+
+        evaluator = ArticleEvaluator()
+        text = '評価 [注] です:\n[{"index": 1, "tags": ["a", "]"]}]\n以上'
+
+        assert evaluator._extract_json(text) == [{"index": 1, "tags": ["a", "]"]}]
+        fenced = '```json\n[{"index": 2}]\n```'
+        assert evaluator._extract_json(fenced) == [{"index": 2}]
+        assert evaluator._extract_json("JSON なし") is None
+
+
+class TestTrendDetector:
+    """TrendDetector のテスト"""
+
+    def test_count_period_reuses_daily_sidecars(self, tmp_path):
+        """終了済みの日の集計を日付単位で再利用し、入力の更新で作り直すこと"""
+        import json
+        import os
+        from datetime import datetime, timedelta, timezone
+
+        from evaluators.trend_detector import TrendDetector
+
+        competitors = tmp_path / "competitors"
+        competitors.mkdir()
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for i in range(10):
+            day = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            data = {"results": [{"entries": [{"title": "MCP", "keywords": ["x"]}]}]}
+            (competitors / f"competitor-{day}.json").write_text(json.dumps(data))
+
+        detector = TrendDetector(data_dir=tmp_path, output_dir=tmp_path / "out")
+        counts_dir = tmp_path / "out" / "counts"
+        for offset in range(3):
+            counts, entries_count = detector._count_period(
+                start + timedelta(days=offset), start + timedelta(days=offset + 6)
+            )
+            assert entries_count == 7
+            assert counts["MCP"] == 7
+        # 期間がずれても日ごとのサイドカーは日数分しか増えない
+        assert len(list(counts_dir.glob("counts-*.json"))) == 9
+
+        # 保存済みの集計が使われること
+        sidecar = counts_dir / "counts-2026-01-01.json"
+        cached = json.loads(sidecar.read_text())
+        cached["counts"]["MCP"] = 100
+        sidecar.write_text(json.dumps(cached))
+        counts, _ = detector._count_period(start, start + timedelta(days=6))
+        assert counts["MCP"] == 106
+
+        # 入力ファイルが更新されたら集計し直すこと
+        source = competitors / "competitor-2026-01-01.json"
+        source.write_text(json.dumps({"results": [{"entries": []}]}))
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        counts, entries_count = detector._count_period(start, start + timedelta(days=6))
+        assert entries_count == 6
+        assert counts["MCP"] == 6
+
+        # AI_KEYWORDS が変わったら集計し直すこと
+        detector = TrendDetector(data_dir=tmp_path, output_dir=tmp_path / "out")
+        detector.AI_KEYWORDS = ["Agent"]
+        detector._ai_keyword_automaton = detector._build_ai_keyword_automaton()
+        counts, entries_count = detector._count_period(start, start + timedelta(days=6))
+        assert entries_count == 6
+        assert "MCP" not in counts
+        assert counts["x"] == 6
@@ -0,0 +1,27 @@
+"""公開 API のインポートテスト"""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("module", "attr"),
+    [
+        ("collectors", "RSSCollector"),
+        ("collectors", "GitHubCollector"),
+        ("collectors", "PageDiffCollector"),
+        ("collectors.models", "CollectedEntry"),
+        ("evaluators", "CategoryClassifier"),
+        ("evaluators", "ClassificationResult"),
+        ("evaluators", "RelevanceScorer"),
+        ("evaluators", "EvaluationResult"),
+        ("evaluators", "ScoringBreakdown"),
+        ("evaluators", "EvaluationLogger"),
+        ("evaluators", "Exporter"),
+        ("evaluators", "ExportConfig"),
+    ],
+)
+def test_public_api(module, attr):
+    """モジュールから公開クラスがインポートできること"""
+    assert getattr(importlib.import_module(module), attr) is not None
@@ -0,0 +1,109 @@
+"""marketing モジュールのテスト"""
+
+import orjson
+
+
+class TestAnalyticsTracker:
+    """AnalyticsTracker のテスト"""
+
+    def test_close_compacts_log_into_snapshot(self, tmp_path):
+        """close でイベントログがスナップショットに畳み込まれ、読み戻せること"""
+        from marketing import AnalyticsTracker
+
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            tracker.record_post("x", "1", "weekly_digest", "2026-W01")
+            tracker.update_metrics("x", "1", impressions=100, engagements=5)
+
+        assert (tmp_path / "performance.jsonl").read_bytes() == b""
+        data = orjson.loads((tmp_path / "performance.json").read_bytes())
+        assert data["posts_by_id"]["x-1"]["metrics"]["impressions"] == 100
+
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            summary = tracker.get_performance_summary()
+        assert summary["posts_count"] == 1
+        assert summary["total_impressions"] == 100
+
+    def test_close_keeps_other_instance_events(self, tmp_path):
+        """別インスタンスの追記が close で失われないこと"""
+        from marketing import AnalyticsTracker
+
+        a = AnalyticsTracker(data_dir=tmp_path)
+        b = AnalyticsTracker(data_dir=tmp_path)
+        a.record_post("x", "1", "weekly_digest", "2026-W01")
+        b.record_post("x", "2", "weekly_digest", "2026-W01")
+        a.close()
+        b.close()
+
+        data = orjson.loads((tmp_path / "performance.json").read_bytes())
+        assert set(data["posts_by_id"]) == {"x-1", "x-2"}
+
+    def test_reads_follow_other_instance_updates(self, tmp_path):
+        """別インスタンスの更新が次の読み取りに反映されること"""
+        from marketing import AnalyticsTracker
+
+        with AnalyticsTracker(data_dir=tmp_path) as a, AnalyticsTracker(data_dir=tmp_path) as b:
+            a.record_post("x", "1", "weekly_digest", "2026-W01")
+            assert a.get_performance_summary()["total_impressions"] == 0
+
+            b.update_metrics("x", "1", impressions=42)
+            assert a.get_performance_summary()["total_impressions"] == 42
+
+    def test_returned_posts_are_copies(self, tmp_path):
+        """返した投稿を書き換えても、集計とスナップショットに影響しないこと"""
+        from marketing import AnalyticsTracker
+
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            post = tracker.record_post("x", "1", "weekly_digest", "2026-W01")
+            assert "published_ts" not in post
+            post["platform"] = "zzz"
+            updated = tracker.update_metrics("x", "1", impressions=100, engagements=5)
+            updated["metrics"]["impressions"] = 0
+            summary = tracker.get_performance_summary()
+            assert "published_ts" not in summary["top_posts"][0]
+            summary["top_posts"][0]["metrics"]["engagements"] = -5
+
+            summary = tracker.get_performance_summary(platform="x")
+            assert summary["posts_count"] == 1
+            assert summary["total_impressions"] == 100
+            assert summary["total_engagements"] == 5
+
+        stored = orjson.loads((tmp_path / "performance.json").read_bytes())["posts_by_id"]["x-1"]
+        assert stored["platform"] == "x"
+        assert stored["metrics"] == {"impressions": 100, "engagements": 5}
+
+    def test_legacy_posts_without_published_ts(self, tmp_path):
+        """published_ts を持たない旧データも期間で絞り込めること"""
+        from datetime import datetime, timedelta, timezone
+
+        from marketing import AnalyticsTracker
+
+        now = datetime.now(timezone.utc)
+        posts = [
+            {"id": "x-new", "platform": "x", "published_at": now.isoformat(), "metrics": {}},
+            {
+                "id": "x-old",
+                "platform": "x",
+                "published_at": (now - timedelta(weeks=10)).isoformat(),
+                "metrics": {},
+            },
+        ]
+        (tmp_path / "performance.json").write_bytes(orjson.dumps({"posts": posts}))
+
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            summary = tracker.get_performance_summary()
+        assert summary["posts_count"] == 1
+        assert [p["id"] for p in summary["top_posts"]] == ["x-new"]
+        assert "published_ts" not in summary["top_posts"][0]
+
+    def test_append_after_truncated_line(self, tmp_path):
+        """改行のない途中行の後に追記しても、新しいイベントが失われないこと"""
+        from marketing import AnalyticsTracker
+
+        (tmp_path / "performance.jsonl").write_bytes(b'{"id": "x-0", "platf')
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            tracker.record_post("x", "1", "weekly_digest", "2026-W01")
+
+        with AnalyticsTracker(data_dir=tmp_path) as tracker:
+            assert tracker.get_performance_summary()["posts_count"] == 1
+        data = orjson.loads((tmp_path / "performance.json").read_bytes())
+        assert set(data["posts_by_id"]) == {"x-1"}